@@ -1,14 +1,74 @@
 from collections import Counter
-from typing import Dict, List
+from typing import Dict, FrozenSet, Iterable, List, Union
 
+from src.transaction_frame import TransactionFrame
 
-def count_categories(transactions: List[Dict], categories: List[str]) -> Dict[str, int]:
-    """Подсчитывает количество операций по категориям"""
-    descriptions = [t.get("description", "").lower() for t in transactions]
-    category_counts: Counter[str] = Counter()
 
-    for category in categories:
-        category_lower = category.lower()
-        category_counts[category] = sum(1 for desc in descriptions if category_lower in desc)
+class CategoryMatcher:
+    """Автомат Ахо — Корасик по списку категорий: за один проход по строке находит все входящие в неё категории.
+
+    Категории сравниваются без учёта регистра как подстроки, пустая категория входит в любую строку.
+    """
+
+    def __init__(self, categories: List[str]) -> None:
+        self.categories = list(categories)
+        self._pattern_ids: Dict[str, int] = {}
+        for category in self.categories:
+            self._pattern_ids.setdefault(category.lower(), len(self._pattern_ids))
+
+        self._goto: List[Dict[str, int]] = [{}]
+        outputs: List[set] = [set()]
+        for pattern, pattern_id in self._pattern_ids.items():
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = self._goto[state][char] = len(self._goto)
+                    self._goto.append({})
+                    outputs.append(set())
+                state = next_state
+            outputs[state].add(pattern_id)
+
+        # Ссылки неудач строятся обходом в ширину, выходы состояния дополняются выходами по ссылке неудачи
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                outputs[next_state] |= outputs[self._fail[next_state]]
+                queue.append(next_state)
+        self._outputs: List[FrozenSet[int]] = [frozenset(output | outputs[0]) for output in outputs]
 
-    return dict(category_counts)
+    def find(self, text: str) -> FrozenSet[int]:
+        """Номера категорий (без учёта повторов и регистра), встречающихся в строке, приведённой к нижнему регистру"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found = outputs[0]
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state] and not outputs[state] <= found:
+                found = found | outputs[state]
+        return found
+
+    def count(self, descriptions: Iterable[str]) -> Dict[str, int]:
+        """Число описаний, в которые входит каждая категория; одинаковые описания просматриваются один раз"""
+        totals = [0] * len(self._pattern_ids)
+        for text, repeats in Counter(descriptions).items():
+            for pattern_id in self.find(text):
+                totals[pattern_id] += repeats
+        return {category: totals[self._pattern_ids[category.lower()]] for category in self.categories}
+
+
+def count_categories(transactions: Union[List[Dict], TransactionFrame], categories: List[str]) -> Dict[str, int]:
+    """Подсчитывает количество операций по категориям"""
+    if isinstance(transactions, TransactionFrame):
+        descriptions = [desc.lower() if desc is not None else "" for desc in transactions.descriptions]
+    else:
+        descriptions = [t.get("description", "").lower() for t in transactions]
+    return CategoryMatcher(categories).count(descriptions)
@@ -1,49 +1,275 @@
+import atexit
 import datetime
+import inspect
+import random
+import reprlib
+import threading
+import time
+from collections import deque
 from functools import wraps
-from typing import Any, Callable, Optional, TypeVar, cast
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, TypeVar, cast
+
+from src import metrics
 
 T = TypeVar("T", bound=Callable[..., Any])
 
+FLUSH_INTERVAL = 1.0
+FLUSH_SIZE = 64 * 1024
+
+_repr = reprlib.Repr()
+_repr.maxlevel = 3
+_repr.maxlist = _repr.maxtuple = _repr.maxset = _repr.maxdict = 10
+_repr.maxstring = _repr.maxother = 200
+
+
+def _write(filename: Optional[str], message: str) -> None:
+    if filename:
+        with open(filename, "a", encoding="utf-8") as f:
+            f.write(message)
+    else:
+        print(message, end="")
+
+
+class _BufferedWriter:
+    """Общий буфер сообщений всех декорированных функций; сбрасывается по объёму, по таймеру и при выходе.
+
+    Под блокировкой буфер только подменяется пустым, запись на диск идёт после её освобождения,
+    поэтому вызовы из других потоков не ждут ввода-вывода. Подменённые буферы записываются по очереди
+    в порядке подмены.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._buffers: Dict[Optional[str], List[str]] = {}
+        self._pending: Deque[Dict[Optional[str], List[str]]] = deque()
+        self._size = 0
+        self._timer: Optional[threading.Timer] = None
+
+    def write(self, filename: Optional[str], message: str) -> None:
+        with self._lock:
+            self._buffers.setdefault(filename, []).append(message)
+            self._size += len(message)
+            if self._size < FLUSH_SIZE:
+                if self._timer is None:
+                    self._timer = threading.Timer(FLUSH_INTERVAL, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+            self._detach()
+        self._drain()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._detach()
+        self._drain()
+
+    def _detach(self) -> None:
+        """Переносит накопленные сообщения в очередь на запись; вызывается под self._lock"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._buffers:
+            self._pending.append(self._buffers)
+            self._buffers = {}
+            self._size = 0
+
+    def _drain(self) -> None:
+        with self._io_lock:
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        return
+                    buffers = self._pending.popleft()
+                for filename, messages in buffers.items():
+                    _write(filename, "".join(messages))
+
+
+_writer = _BufferedWriter()
+atexit.register(_writer.flush)
+
+
+def flush_logs() -> None:
+    """Записывает сообщения, накопленные декораторами в буферизованном режиме"""
+    _writer.flush()
+
+
+def _now() -> str:
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class _CallLog:
+    """Записи в лог об одном вызове декорированной функции: начало, итог и длительность"""
+
+    def __init__(
+        self,
+        emit: Callable[[Optional[str], str], None],
+        filename: Optional[str],
+        func: Callable[..., Any],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        sample_rate: float,
+        metric_name: Optional[str],
+    ) -> None:
+        self.emit = emit
+        self.filename = filename
+        self.func_name = func.__name__
+        self.args = args
+        self.kwargs = kwargs
+        self.metric_name = metric_name
+        self.sampled = sample_rate >= 1 or random.random() < sample_rate
+        self.timestamp = _now() if self.sampled else ""
+        self.started = 0.0
+
+    def _emit_start(self) -> None:
+        args_repr = [_repr.repr(arg) for arg in self.args]
+        kwargs_repr = [f"{k}={_repr.repr(v)}" for k, v in self.kwargs.items()]
+        signature = ", ".join(args_repr + kwargs_repr)
+        self.emit(self.filename, f"{self.timestamp} - {self.func_name} - START\nArgs: {signature}\n")
 
-def log(filename: Optional[str] = None) -> Callable[[T], T]:
-    """Автоматически логирует начало и конец выполнения функции, а также ее результаты или возникшие ошибки"""
+    def _emit_end(self, message: str, elapsed: float) -> None:
+        timing = f"Time: {elapsed:.6f}s\n" if self.metric_name else ""
+        self.emit(self.filename, f"{self.timestamp} - {self.func_name} - {message}\n{timing}END\n")
+
+    def start(self) -> None:
+        if self.sampled:
+            self._emit_start()
+        self.started = time.perf_counter()
+
+    def success(self, message: Callable[[], str]) -> None:
+        elapsed = time.perf_counter() - self.started
+        if self.metric_name:
+            metrics.registry.observe(self.metric_name, elapsed)
+        if self.sampled:
+            self._emit_end(message(), elapsed)
+
+    def failure(self, error: BaseException, prefix: str = "") -> None:
+        elapsed = time.perf_counter() - self.started
+        if self.metric_name:
+            metrics.registry.observe(self.metric_name, elapsed, error=True)
+        if not self.sampled:
+            self.timestamp = _now()
+            self._emit_start()
+        self._emit_end(f"{prefix}Error: {type(error).__name__}: {error}", elapsed)
+
+
+def log(
+    filename: Optional[str] = None, buffered: bool = False, sample_rate: float = 1.0, timing: bool = False
+) -> Callable[[T], T]:
+    """Автоматически логирует начало и конец выполнения функции, а также ее результаты или возникшие ошибки.
+
+    В режиме buffered сообщения копятся в общем буфере и записываются пачками. При sample_rate < 1
+    логируется только указанная доля вызовов, ошибки логируются всегда. Аргументы и результат
+    переводятся в строку только для логируемых вызовов и с ограничением длины. С timing=True
+    длительность каждого вызова пишется в лог и в реестр метрик src.metrics.
+
+    Для корутин учитывается выполнение, а не создание корутины. Для генераторов и асинхронных
+    генераторов начало — первый запрос элемента, конец — исчерпание, ошибка или закрытие, в лог
+    пишется число выданных элементов.
+    """
+    emit = _writer.write if buffered else _write
 
     def decorator(func: T) -> T:
-        @wraps(func)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            func_name = func.__name__
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            args_repr = [repr(arg) for arg in args]
-            kwargs_repr = [f"{k}={repr(v)}" for k, v in kwargs.items()]
-            signature = ", ".join(args_repr + kwargs_repr)
-
-            start_msg = f"{timestamp} - {func_name} - START\nArgs: {signature}\n"
-            if filename:
-                with open(filename, "a", encoding="utf-8") as f:
-                    f.write(start_msg)
-            else:
-                print(start_msg, end="")
+        metric_name = f"{func.__module__}.{func.__qualname__}" if timing else None
 
-            try:
-                result = func(*args, **kwargs)
+        def new_call(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> _CallLog:
+            return _CallLog(emit, filename, func, args, kwargs, sample_rate, metric_name)
 
-                success_msg = f"{timestamp} - {func_name} - Result: {result!r}\nEND\n"
-                if filename:
-                    with open(filename, "a", encoding="utf-8") as f:
-                        f.write(success_msg)
-                else:
-                    print(success_msg, end="")
+        if inspect.isasyncgenfunction(func):
 
+            @wraps(func)
+            async def async_gen_wrapper(*args: Any, **kwargs: Any) -> Any:
+                call = new_call(args, kwargs)
+                call.start()
+                count = 0
+                agen = func(*args, **kwargs)
+                try:
+                    item = await agen.__anext__()
+                    while True:
+                        count += 1
+                        try:
+                            sent = yield item
+                        except GeneratorExit:
+                            raise
+                        except BaseException as e:
+                            item = await agen.athrow(e)
+                        else:
+                            item = await agen.asend(sent)
+                except StopAsyncIteration:
+                    call.success(lambda: f"Yielded: {count} items")
+                except GeneratorExit:
+                    call.success(lambda: f"Closed after {count} items")
+                    raise
+                except Exception as e:
+                    call.failure(e, prefix=f"Yielded: {count} items, ")
+                    raise
+                finally:
+                    await agen.aclose()
+
+            return cast(T, async_gen_wrapper)
+
+        if inspect.isgeneratorfunction(func):
+
+            @wraps(func)
+            def gen_wrapper(*args: Any, **kwargs: Any) -> Any:
+                call = new_call(args, kwargs)
+                call.start()
+                count = 0
+                gen = func(*args, **kwargs)
+                try:
+                    # Значения send() и исключения throw() передаются обёрнутому генератору, как при yield from
+                    item = next(gen)
+                    while True:
+                        count += 1
+                        try:
+                            sent = yield item
+                        except GeneratorExit:
+                            raise
+                        except BaseException as e:
+                            item = gen.throw(e)
+                        else:
+                            item = gen.send(sent)
+                except StopIteration as stop:
+                    call.success(lambda: f"Yielded: {count} items")
+                    return stop.value
+                except GeneratorExit:
+                    call.success(lambda: f"Closed after {count} items")
+                    raise
+                except Exception as e:
+                    call.failure(e, prefix=f"Yielded: {count} items, ")
+                    raise
+                finally:
+                    gen.close()
+
+            return cast(T, gen_wrapper)
+
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                call = new_call(args, kwargs)
+                call.start()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as e:
+                    call.failure(e)
+                    raise
+                call.success(lambda: f"Result: {_repr.repr(result)}")
                 return result
 
+            return cast(T, async_wrapper)
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            call = new_call(args, kwargs)
+            call.start()
+            try:
+                result = func(*args, **kwargs)
             except Exception as e:
-                error_msg = f"{timestamp} - {func_name} - Error: {type(e).__name__}: {e}\nEND\n"
-                if filename:
-                    with open(filename, "a", encoding="utf-8") as f:
-                        f.write(error_msg)
-                else:
-                    print(error_msg, end="")
+                call.failure(e)
                 raise
+            call.success(lambda: f"Result: {_repr.repr(result)}")
+            return result
 
         return cast(T, wrapper)
 
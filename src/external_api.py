@@ -1,14 +1,277 @@
+import asyncio
+import json
 import os
+import random
+import threading
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from src.metrics import timed
 
 load_dotenv()
 
 API_KEY = os.getenv("API_KEY")
 BASE_URL = "https://api.apilayer.com/exchangerates_data/latest"
+RATES_CACHE_TTL = float(os.getenv("RATES_CACHE_TTL", "3600"))
+RATES_CACHE_FILE = os.getenv("RATES_CACHE_FILE")
+RATES_TIMEOUT = float(os.getenv("RATES_TIMEOUT", "3"))
+RATES_CONCURRENCY = int(os.getenv("RATES_CONCURRENCY", "4"))
+SUPPORTED_CURRENCIES = ("USD", "EUR")
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RatesUnavailableError(Exception):
+    """Курсы валют недоступны: провайдер не отвечает или цепь разомкнута"""
+
+
+class RateCache:
+    """Кэш курсов валют к рублю с ограниченным временем жизни записей"""
+
+    def __init__(self, ttl: float = RATES_CACHE_TTL, snapshot_path: Optional[str] = None) -> None:
+        self.ttl = ttl
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._rates: Dict[str, Tuple[float, float]] = {}
+        if self.snapshot_path is not None:
+            self.load()
+
+    def get(self, currency: str) -> Optional[float]:
+        """Возвращает курс из кэша или None, если записи нет или она устарела"""
+        currency = currency.upper()
+        entry = self._rates.get(currency)
+        if entry is None:
+            return None
+        rate, fetched_at = entry
+        if time.time() - fetched_at > self.ttl:
+            del self._rates[currency]
+            return None
+        return rate
+
+    def set(self, currency: str, rate: float) -> None:
+        """Сохраняет курс в кэш и, если задан файл снимка, на диск"""
+        self._rates[currency.upper()] = (rate, time.time())
+        if self.snapshot_path is not None:
+            self.save()
+
+    def update(self, rates: Dict[str, float]) -> None:
+        """Сохраняет несколько курсов разом, записывая снимок один раз"""
+        now = time.time()
+        for currency, rate in rates.items():
+            self._rates[currency.upper()] = (rate, now)
+        if rates and self.snapshot_path is not None:
+            self.save()
+
+    def invalidate(self, currency: Optional[str] = None) -> None:
+        """Сбрасывает курс одной валюты или весь кэш"""
+        if currency is None:
+            self._rates.clear()
+        else:
+            self._rates.pop(currency.upper(), None)
+        if self.snapshot_path is not None:
+            self.save()
+
+    def save(self) -> None:
+        """Записывает снимок кэша на диск"""
+        if self.snapshot_path is None:
+            return
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump({code: list(entry) for code, entry in self._rates.items()}, f)
+            tmp_path.replace(self.snapshot_path)
+        except OSError:
+            pass
+
+    def load(self) -> None:
+        """Загружает снимок кэша с диска, пропуская устаревшие записи"""
+        if self.snapshot_path is None or not self.snapshot_path.is_file():
+            return
+        try:
+            with self.snapshot_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            now = time.time()
+            for code, (rate, fetched_at) in data.items():
+                if now - float(fetched_at) <= self.ttl:
+                    self._rates[code] = (float(rate), float(fetched_at))
+        except (OSError, ValueError, TypeError, AttributeError):
+            return
+
+
+class CircuitBreaker:
+    """Размыкает цепь после серии неудачных запросов и пропускает пробный запрос по истечении паузы"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None and time.monotonic() - self._opened_at < self.reset_timeout
+
+    def allow(self) -> bool:
+        """Проверяет, можно ли выполнить запрос.
+
+        По истечении паузы пробный запрос разрешается только одному вызывающему: пауза отсчитывается
+        заново, и до результата пробного запроса остальные получают отказ.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at < self.reset_timeout:
+                return False
+            self._opened_at = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    def reset(self) -> None:
+        self.record_success()
+
+
+class RatesClient:
+    """Клиент API курсов валют с пулом соединений, повторами с джиттером и автоматическим выключателем"""
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        api_key: Optional[str] = API_KEY,
+        timeout: float = RATES_TIMEOUT,
+        max_retries: int = 2,
+        backoff: float = 0.2,
+        breaker: Optional[CircuitBreaker] = None,
+        pool_size: int = 10,
+    ) -> None:
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if api_key:
+            self.session.headers["apikey"] = api_key
+
+    def latest(self, base: str, symbols: Iterable[str]) -> Dict[str, Any]:
+        """Запрашивает последние курсы валют symbols относительно base"""
+        if not self.breaker.allow():
+            raise RatesUnavailableError("Сервис курсов валют недоступен: цепь разомкнута")
+
+        params = {"base": base, "symbols": ",".join(symbols)}
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(random.uniform(0, self.backoff * 2 ** (attempt - 1)))
+            try:
+                response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+                if response.status_code in RETRY_STATUSES:
+                    last_error = requests.HTTPError(f"HTTP {response.status_code}", response=response)
+                    continue
+                response.raise_for_status()
+                rates = dict(response.json()["rates"])
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = e
+                continue
+            except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+                last_error = e
+                break
+            self.breaker.record_success()
+            return rates
+
+        self.breaker.record_failure()
+        raise RatesUnavailableError(f"Не удалось получить курсы валют: {last_error}") from last_error
+
+    def close(self) -> None:
+        self.session.close()
+
+
+rates_cache = RateCache(snapshot_path=RATES_CACHE_FILE)
+rates_client = RatesClient()
+_inflight: Dict[Tuple[asyncio.AbstractEventLoop, str], "asyncio.Task[Optional[float]]"] = {}
+
+
+def get_rate(currency: str) -> Optional[float]:
+    """Возвращает курс валюты к рублю, обращаясь к API только при промахе кэша"""
+    currency = currency.upper()
+    rate = rates_cache.get(currency)
+    if rate is not None:
+        return rate
 
+    try:
+        rate = float(rates_client.latest(currency, ["RUB"])["RUB"])
+    except (RatesUnavailableError, KeyError, TypeError, ValueError):
+        return None
+
+    rates_cache.set(currency, rate)
+    return rate
+
+
+@timed()
+def get_rates(currencies: Iterable[str]) -> Dict[str, float]:
+    """Возвращает курсы нескольких валют к рублю, запрашивая все недостающие одним запросом.
+
+    Запрос идёт с базой RUB, поэтому курс валюты к рублю получается как 1 / rates[currency].
+    Валюты, курс которых получить не удалось, в результат не попадают.
+    """
+    rates: Dict[str, float] = {}
+    missing: List[str] = []
+    for currency in sorted({c.upper() for c in currencies}):
+        rate = rates_cache.get(currency)
+        if rate is None:
+            missing.append(currency)
+        else:
+            rates[currency] = rate
+
+    if not missing:
+        return rates
+
+    try:
+        fetched = rates_client.latest("RUB", missing)
+    except RatesUnavailableError:
+        return rates
 
+    resolved: Dict[str, float] = {}
+    for currency in missing:
+        try:
+            resolved[currency] = 1 / float(fetched[currency])
+        except (KeyError, TypeError, ValueError, ZeroDivisionError):
+            continue
+    rates_cache.update(resolved)
+    rates.update(resolved)
+    return rates
+
+
+@timed()
+def convert_many(transactions: Iterable[dict]) -> List[float]:
+    """Конвертирует суммы пачки транзакций в рубли, получая курсы всех валют одним запросом"""
+    rows = [(float(t["amount"]), t.get("currency", "RUB").upper()) for t in transactions]
+    rates = get_rates(currency for _, currency in rows if currency in SUPPORTED_CURRENCIES)
+    rates["RUB"] = 1.0
+    return [amount * rates.get(currency, 0.0) for amount, currency in rows]
+
+
+@timed()
 def convert_to_rub(transaction: dict) -> float:
     """Конвертирует сумму транзакции в рубли"""
     amount = float(transaction["amount"])
@@ -16,15 +279,65 @@ def convert_to_rub(transaction: dict) -> float:
 
     if currency == "RUB":
         return amount
-    elif currency not in ("USD", "EUR"):
+    elif currency not in SUPPORTED_CURRENCIES:
         return 0.0
 
-    try:
-        response = requests.get(
-            BASE_URL, params={"base": currency, "symbols": "RUB"}, headers={"apikey": API_KEY}, timeout=10
-        )
-        response.raise_for_status()
-        rate = float(response.json()["rates"]["RUB"])
-        return amount * rate
-    except Exception:
+    rate = get_rate(currency)
+    if rate is None:
+        return 0.0
+    return amount * rate
+
+
+async def _fetch_rate_async(currency: str, semaphore: Optional[asyncio.Semaphore]) -> Optional[float]:
+    async with AsyncExitStack() as stack:
+        if semaphore is not None:
+            await stack.enter_async_context(semaphore)
+        return await asyncio.to_thread(get_rate, currency)
+
+
+async def get_rate_async(currency: str, semaphore: Optional[asyncio.Semaphore] = None) -> Optional[float]:
+    """Асинхронно возвращает курс валюты к рублю.
+
+    Одновременные запросы одной и той же валюты объединяются в одно обращение к API,
+    сам HTTP-запрос выполняется в фоновом потоке и не блокирует цикл событий.
+    """
+    currency = currency.upper()
+    rate = rates_cache.get(currency)
+    if rate is not None:
+        return rate
+
+    key = (asyncio.get_running_loop(), currency)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_fetch_rate_async(currency, semaphore))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
+async def convert_to_rub_async(transaction: dict, semaphore: Optional[asyncio.Semaphore] = None) -> float:
+    """Асинхронный вариант convert_to_rub"""
+    amount = float(transaction["amount"])
+    currency = transaction.get("currency", "RUB").upper()
+
+    if currency == "RUB":
+        return amount
+    elif currency not in SUPPORTED_CURRENCIES:
+        return 0.0
+
+    rate = await get_rate_async(currency, semaphore)
+    if rate is None:
         return 0.0
+    return amount * rate
+
+
+async def convert_many_async(transactions: Iterable[dict], concurrency: int = RATES_CONCURRENCY) -> List[float]:
+    """Асинхронно конвертирует суммы пачки транзакций в рубли, запрашивая курсы не более concurrency за раз"""
+    semaphore = asyncio.Semaphore(concurrency)
+    rows = [(float(t["amount"]), t.get("currency", "RUB").upper()) for t in transactions]
+    currencies = sorted({currency for _, currency in rows if currency in SUPPORTED_CURRENCIES})
+    resolved = await asyncio.gather(*(get_rate_async(currency, semaphore) for currency in currencies))
+
+    rates = {currency: rate for currency, rate in zip(currencies, resolved) if rate is not None}
+    rates["RUB"] = 1.0
+    return [amount * rates.get(currency, 0.0) for amount, currency in rows]
@@ -1,11 +1,135 @@
 import re
-from typing import Dict, List
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Literal, Optional, Sequence, Tuple, Union, overload
 
+import numpy as np
 
-def filter_by_description(transactions: List[Dict], search_string: str) -> List[Dict]:
-    """Фильтрует транзакции по строке в описании с использованием регулярных выражений"""
+from src.metrics import timed
+from src.models import Transaction
+from src.transaction_frame import TransactionFrame
+
+PATTERN_CACHE_SIZE = 256
+REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+
+Matcher = Callable[[str], bool]
+SearchMode = Literal["any", "all"]
+
+
+def _never(text: str) -> bool:
+    return False
+
+
+def _is_literal(term: str) -> bool:
+    return not REGEX_METACHARACTERS.intersection(term)
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def _compile_matcher(terms: Tuple[str, ...], mode: SearchMode) -> Matcher:
+    """Строит проверку описания по набору терминов; некорректное регулярное выражение не совпадает ни с чем"""
+    if all(_is_literal(term) for term in terms):
+        literals = tuple(term.lower() for term in terms)
+        if len(literals) == 1:
+            literal = literals[0]
+            return lambda text: literal in text.lower()
+
+        def match_literals(text: str) -> bool:
+            lowered = text.lower()
+            found = (literal in lowered for literal in literals)
+            return any(found) if mode == "any" else all(found)
+
+        return match_literals
+
+    try:
+        patterns = [re.compile(term, re.IGNORECASE) for term in terms]
+    except re.error:
+        return _never
+    if len(patterns) == 1:
+        single = patterns[0]
+        return lambda text: single.search(text) is not None
+
+    # Термины объединяются в одно выражение; если объединение не компилируется (например, из-за
+    # встроенных флагов в начале термина), термины проверяются по отдельности
     try:
-        pattern = re.compile(search_string, re.IGNORECASE)
-        return [t for t in transactions if "description" in t and pattern.search(t["description"])]
+        if mode == "any":
+            combined = re.compile("|".join(f"(?:{term})" for term in terms), re.IGNORECASE)
+        else:
+            combined = re.compile("".join(f"(?=.*?(?:{term}))" for term in terms), re.IGNORECASE | re.DOTALL)
     except re.error:
-        return []
+
+        def match_patterns(text: str) -> bool:
+            found = (pattern.search(text) is not None for pattern in patterns)
+            return any(found) if mode == "any" else all(found)
+
+        return match_patterns
+    if mode == "any":
+        return lambda text: combined.search(text) is not None
+    return lambda text: combined.match(text) is not None
+
+
+def description_matcher(search: Union[str, Sequence[str]], mode: SearchMode = "any") -> Matcher:
+    """Возвращает проверку описания без учёта регистра: регулярное выражение или список терминов.
+
+    Для списка mode="any" требует совпадения хотя бы одного термина, mode="all" — всех. Термины без
+    метасимволов ищутся как подстроки без регулярных выражений. Скомпилированные проверки кэшируются.
+    """
+    if mode not in ("any", "all"):
+        raise ValueError(f"Неизвестный режим поиска: {mode}")
+    terms = (search,) if isinstance(search, str) else tuple(search)
+    return _compile_matcher(terms, mode)
+
+
+def pattern_cache_info() -> Dict[str, Optional[int]]:
+    """Статистика кэша скомпилированных шаблонов поиска"""
+    return _compile_matcher.cache_info()._asdict()
+
+
+def clear_pattern_cache() -> None:
+    _compile_matcher.cache_clear()
+
+
+def _description(transaction: Union[Dict, Transaction]) -> Optional[str]:
+    if isinstance(transaction, Transaction):
+        return transaction.description or None
+    return transaction.get("description")
+
+
+@overload
+def filter_by_description(
+    transactions: TransactionFrame, search_string: Union[str, Sequence[str]], mode: SearchMode = "any"
+) -> TransactionFrame: ...
+
+
+@overload
+def filter_by_description(
+    transactions: List[Dict], search_string: Union[str, Sequence[str]], mode: SearchMode = "any"
+) -> List[Dict]: ...
+
+
+@overload
+def filter_by_description(
+    transactions: List[Transaction], search_string: Union[str, Sequence[str]], mode: SearchMode = "any"
+) -> List[Transaction]: ...
+
+
+@timed()
+def filter_by_description(
+    transactions: Union[List[Any], TransactionFrame],
+    search_string: Union[str, Sequence[str]],
+    mode: SearchMode = "any",
+) -> Union[List[Any], TransactionFrame]:
+    """Фильтрует транзакции по строке в описании с использованием регулярных выражений.
+
+    Вместо одной строки можно передать список терминов, mode задаёт, должен совпасть любой из них или все.
+    """
+    matcher = description_matcher(search_string, mode)
+    if matcher is _never:
+        return transactions.take([]) if isinstance(transactions, TransactionFrame) else []
+
+    if isinstance(transactions, TransactionFrame):
+        mask = np.fromiter(
+            (desc is not None and matcher(desc) for desc in transactions.descriptions),
+            dtype=bool,
+            count=len(transactions),
+        )
+        return transactions.where(mask)
+    return [t for t in transactions if (desc := _description(t)) is not None and matcher(desc)]
@@ -1,13 +1,23 @@
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Union
 
+from src.transaction_frame import TransactionFrame
 
-def filter_by_currency(transactions: List[Dict[str, Any]], currency: str) -> Iterator[Dict[str, Any]]:
+
+def filter_by_currency(
+    transactions: Union[List[Dict[str, Any]], TransactionFrame], currency: str
+) -> Iterator[Dict[str, Any]]:
     """Принимает на вход список словарей, представляющих транзакции."""
+    if isinstance(transactions, TransactionFrame):
+        return iter(transactions.filter_by_currency(currency))
     return (transaction for transaction in transactions if transaction.get("currency") == currency)
 
 
-def transaction_descriptions(transactions: List[Dict[str, Any]]) -> Iterator[Optional[str]]:
+def transaction_descriptions(
+    transactions: Union[List[Dict[str, Any]], TransactionFrame],
+) -> Iterator[Optional[str]]:
     """Принимает список словарей с транзакциями и возвращает описание каждой операции по очереди."""
+    if isinstance(transactions, TransactionFrame):
+        return iter(transactions.descriptions.tolist())
     return (transaction.get("description") for transaction in transactions)
 
 
@@ -1,22 +1,142 @@
+import atexit
 import logging
+import queue
+import random
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import Dict, Optional
+
+LOG_DIR = Path("logs")
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_lock = threading.Lock()
+_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+
+
+class RoutingFileHandler(logging.Handler):
+    """Пишет каждую запись в файл logs/<имя логгера>.log; файлы открываются один раз за процесс"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._handlers: Dict[str, logging.FileHandler] = {}
+
+    def add_route(self, name: str, log_file: Path) -> None:
+        handler = logging.FileHandler(log_file, mode="w", encoding="utf-8")
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        self._handlers[name] = handler
+
+    def emit(self, record: logging.LogRecord) -> None:
+        name: Optional[str] = record.name
+        while name:
+            handler = self._handlers.get(name)
+            if handler is not None:
+                handler.handle(record)
+                return
+            name = name.rpartition(".")[0]
+
+    def close(self) -> None:
+        for handler in self._handlers.values():
+            handler.close()
+        super().close()
+
+
+class RateLimitFilter(logging.Filter):
+    """Пропускает не более rate записей в секунду (с запасом burst); WARNING и выше проходят всегда"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        super().__init__()
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        self.dropped += 1
+        return False
+
+
+class SamplingFilter(logging.Filter):
+    """Пропускает долю sample_rate записей; WARNING и выше проходят всегда"""
+
+    def __init__(self, sample_rate: float) -> None:
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or random.random() < self.sample_rate:
+            return True
+        self.dropped += 1
+        return False
+
+
+_router = RoutingFileHandler()
+
+
+def _start_listener() -> None:
+    global _listener
+    if _listener is None:
+        _listener = QueueListener(_queue, _router)
+        _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Дописывает накопленные в очереди записи и останавливает фоновый поток записи"""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+atexit.register(shutdown_logging)
 
 
 def setup_logging() -> None:
     """Настройка системы логирования для всего проекта"""
-    logs_dir = Path("../logs")
-    logs_dir.mkdir(exist_ok=True)
+    LOG_DIR.mkdir(exist_ok=True)
+
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT, handlers=[])
+
+
+def _replace_filter(logger: logging.Logger, new_filter: logging.Filter) -> None:
+    for log_filter in list(logger.filters):
+        if type(log_filter) is type(new_filter):
+            logger.removeFilter(log_filter)
+    logger.addFilter(new_filter)
 
-    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", handlers=[])
 
+def get_logger(name: str, rate_limit: Optional[float] = None, sample_rate: Optional[float] = None) -> logging.Logger:
+    """Возвращает настроенный логгер для модуля.
 
-def get_logger(name: str) -> logging.Logger:
-    """Возвращает настроенный логгер для модуля"""
+    Записи передаются через очередь фоновому потоку, который пишет их в logs/<name>.log, поэтому вызов
+    логгера не ждёт диска. Повторный вызов не добавляет обработчиков и не обнуляет файл. Переданный
+    rate_limit (записей в секунду) или sample_rate (доля сохраняемых записей) заменяет прежнее ограничение
+    того же вида, а не переданные ограничения остаются как были.
+    """
     logger = logging.getLogger(name)
 
-    log_file = f"logs/{name}.log"
-    file_handler = logging.FileHandler(log_file, mode="w")
-    file_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    with _lock:
+        if not any(isinstance(handler, QueueHandler) for handler in logger.handlers):
+            LOG_DIR.mkdir(exist_ok=True)
+            _router.add_route(name, LOG_DIR / f"{name}.log")
+            logger.addHandler(QueueHandler(_queue))
+        _start_listener()
 
-    logger.addHandler(file_handler)
+    if rate_limit is not None:
+        _replace_filter(logger, RateLimitFilter(rate_limit))
+    if sample_rate is not None:
+        _replace_filter(logger, SamplingFilter(sample_rate))
     return logger
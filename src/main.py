@@ -1,18 +1,23 @@
+import argparse
 import csv
 import json
 import os
-from typing import Dict, List
+import sys
+import time
+from typing import Dict, Generator, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
 
-import pandas as pd
-
-from src.filters import filter_by_description
 from src.logger_config import setup_logging
-from src.masks import mask_credit_card
-from src.utils import format_phone_number
+from src.masks import mask_credit_card, mask_many
+from src.metrics import timed
+from src.models import Transaction
+from src.parsed_cache import read_excel_cached
+from src.query import TransactionQuery
+from src.utils import format_phone_number, iter_transactions
 
 setup_logging()
 
 
+@timed()
 def load_transactions_from_json(filepath: str) -> List[Dict]:
     """Загружает транзакции из JSON-файла."""
     if not os.path.exists(filepath):
@@ -34,65 +39,137 @@ def load_transactions_from_json(filepath: str) -> List[Dict]:
         return []
 
 
-def load_transactions_from_csv(filepath: str) -> List[Dict]:
-    transactions = []
+CSV_DELIMITERS = ",;\t|"
+CSV_SNIFF_SIZE = 4096
+
+
+def _sniff_delimiter(sample: str) -> str:
+    """Определяет разделитель CSV по небольшому фрагменту файла"""
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error:
+        return ","
+
+
+def _reshape_csv_row(row: Dict) -> Dict:
+    """Собирает плоские колонки суммы и валюты во вложенную структуру operationAmount"""
+    transaction = {k: v for k, v in row.items() if v is not None}
+    if (
+        "operationAmount.amount" in transaction
+        and "operationAmount.currency.name" in transaction
+        and "operationAmount.currency.code" in transaction
+    ):
+        amount = transaction.pop("operationAmount.amount")
+        currency_name = transaction.pop("operationAmount.currency.name")
+        currency_code = transaction.pop("operationAmount.currency.code")
+        transaction["operationAmount"] = {
+            "amount": amount,
+            "currency": {"name": currency_name, "code": currency_code},
+        }
+    elif "amount" in transaction and "currency_code" in transaction:
+        amount = transaction.pop("amount")
+        currency_name = transaction.pop("currency_name", "")
+        currency_code = transaction.pop("currency_code")
+        transaction["operationAmount"] = {
+            "amount": amount,
+            "currency": {"name": currency_name, "code": currency_code},
+        }
+    return transaction
+
+
+def iter_transactions_from_csv(filepath: str, strict: bool = False) -> Generator[Dict, None, None]:
+    """Построчно читает транзакции из CSV-файла, определяя разделитель автоматически.
+
+    При strict=True ошибка чтения не печатается, а передаётся вызывающему коду.
+    """
     try:
-        with open(filepath, mode="r", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                transaction = {k: v for k, v in row.items() if v is not None}
-                if (
-                    "operationAmount.amount" in transaction
-                    and "operationAmount.currency.name" in transaction
-                    and "operationAmount.currency.code" in transaction
-                ):
-                    amount = transaction.pop("operationAmount.amount")
-                    currency_name = transaction.pop("operationAmount.currency.name")
-                    currency_code = transaction.pop("operationAmount.currency.code")
-                    transaction["operationAmount"] = {
-                        "amount": amount,
-                        "currency": {"name": currency_name, "code": currency_code},
-                    }
-                transactions.append(transaction)
+        with open(filepath, mode="r", encoding="utf-8", newline="") as file:
+            delimiter = _sniff_delimiter(file.read(CSV_SNIFF_SIZE))
+            file.seek(0)
+            for row in csv.DictReader(file, delimiter=delimiter):
+                yield _reshape_csv_row(row)
     except FileNotFoundError:
+        if strict:
+            raise
         print(f"Ошибка: Файл {filepath} не найден.")
     except Exception as e:
+        if strict:
+            raise
         print(f"Произошла ошибка при чтении CSV-файла {filepath}: {e}")
-    return transactions
 
 
-def load_transactions_from_xlsx(filepath: str) -> List[Dict]:
+@timed()
+def load_transactions_from_csv(filepath: str) -> List[Dict]:
+    return list(iter_transactions_from_csv(filepath))
+
+
+@timed()
+def load_transactions_from_xlsx(filepath: str, strict: bool = False) -> List[Dict]:
     transactions = []
     try:
-        df = pd.read_excel(filepath)
+        df = read_excel_cached(filepath)
         transactions = df.to_dict("records")
     except FileNotFoundError:
+        if strict:
+            raise
         print(f"Ошибка: Файл {filepath} не найден. Проверьте путь.")
     except Exception as e:
+        if strict:
+            raise
         print(f"Произошла ошибка при чтении XLSX-файла {filepath}: {e}")
     return transactions
 
 
-def print_transactions(transactions: List[Dict]) -> None:
+def iter_transactions_from_file(filepath: str, strict: bool = False) -> Iterator[Dict]:
+    """Возвращает поток транзакций из файла, выбирая загрузчик по расширению.
+
+    При strict=True ошибки чтения передаются вызывающему коду, а не печатаются в stdout.
+    """
+    filepath_lower = filepath.lower()
+    if filepath_lower.endswith((".json", ".jsonl", ".ndjson")):
+        return iter_transactions(filepath, strict=strict)
+    if filepath_lower.endswith(".csv"):
+        return iter_transactions_from_csv(filepath, strict=strict)
+    if filepath_lower.endswith((".xlsx", ".xls")):
+        return iter(load_transactions_from_xlsx(filepath, strict=strict))
+    raise ValueError(f"Неподдерживаемый формат файла: {filepath}")
+
+
+def _format_amount(amount: Optional[float]) -> str:
+    if amount is None:
+        return "N/A"
+    return str(int(amount)) if amount.is_integer() else str(amount)
+
+
+def _display_date_and_amount(item: Union[Dict, Transaction], record: Transaction) -> Tuple[str, str]:
+    """Дата и сумма для вывода в том виде, в каком они записаны в исходном словаре"""
+    date_str = record.date.date().isoformat() if record.date else ""
+    amount = _format_amount(record.amount)
+    if isinstance(item, dict):
+        raw_date = item.get("date")
+        if isinstance(raw_date, str) and raw_date:
+            date_str = raw_date.split("T")[0]
+        operation_amount = item.get("operationAmount")
+        raw_amount = operation_amount.get("amount") if isinstance(operation_amount, dict) else item.get("amount")
+        if isinstance(raw_amount, str) and raw_amount:
+            amount = raw_amount
+    return date_str, amount
+
+
+def print_transactions(transactions: Sequence[Union[Dict, Transaction]]) -> None:
     """Печатает отформатированный список транзакций."""
     if not transactions:
         print("Не найдено ни одной транзакции, подходящей под ваши условия фильтрации.")
         return
 
     print(f"\nВсего банковских операций в выборке: {len(transactions)}")
-    for t in transactions:
-        date_str = t.get("date", "")
-        if date_str:
-            date_str = date_str.split("T")[0]
-
-        description = t.get("description", "Нет описания")
-        amount = t.get("operationAmount", {}).get("amount", "N/A")
-        currency = t.get("operationAmount", {}).get("currency", {}).get("name", "")
-        from_acc = t.get("from", "")
-        to_acc = t.get("to", "")
-
-        from_masked = mask_credit_card(from_acc) if from_acc else ""
-        to_masked = mask_credit_card(to_acc) if to_acc else ""
+    records = [item if isinstance(item, Transaction) else Transaction.from_dict(item) for item in transactions]
+    masked = mask_many([t.from_account for t in records] + [t.to_account for t in records])
+    count = len(records)
+    for item, t, from_masked, to_masked in zip(transactions, records, masked[:count], masked[count:]):
+        date_str, amount = _display_date_and_amount(item, t)
+        description = t.description or "Нет описания"
+        currency = t.currency_name
 
         if from_masked and to_masked:
             print(f"{date_str} {description} {from_masked} -> {to_masked} Сумма: {amount} {currency}")
@@ -133,7 +210,8 @@ def main() -> None:
             print("Для обработки выбран CSV-файл.")
             transactions_filepath = input("Введите путь к CSV-файлу (например, data/transactions.csv): ")
             transactions = load_transactions_from_csv(transactions_filepath)
-            print("Чтение CSV пока не реализовано. Выберите другой вариант.")
+            if not transactions:
+                print("Не удалось загрузить транзакции. Попробуйте снова.")
         elif choice == "3":
             print("Для обработки выбран XLSX-файл.")
             transactions_filepath = input("Введите путь к XLSX-файлу (например, data/transactions.xlsx): ")
@@ -145,7 +223,7 @@ def main() -> None:
         else:
             print("Некорректный выбор. Попробуйте снова.")
 
-    filtered_transactions = list(transactions)
+    query = TransactionQuery()
 
     available_statuses = ["EXECUTED", "CANCELED", "PENDING"]
     while True:
@@ -156,7 +234,7 @@ def main() -> None:
         status_input = input("Пользователь: ").upper()
 
         if status_input in available_statuses:
-            filtered_transactions = [t for t in filtered_transactions if t.get("state", "").upper() == status_input]
+            query.where_state(status_input)
             print(f'Операции отфильтрованы по статусу "{status_input}"')
             break
         else:
@@ -173,8 +251,7 @@ def main() -> None:
         while True:
             order_choice = input("Отсортировать по возрастанию или по убыванию? Пользователь: ").lower()
             if order_choice in ["по возрастанию", "по убыванию"]:
-                reverse_sort = order_choice == "по убыванию"
-                filtered_transactions.sort(key=lambda t: t.get("date", ""), reverse=reverse_sort)
+                query.order_by_date(reverse=order_choice == "по убыванию")
                 break
             else:
                 print("Некорректный ввод. Пожалуйста, введите 'по возрастанию' или 'по убыванию'.")
@@ -187,11 +264,7 @@ def main() -> None:
             print("Некорректный ввод. Пожалуйста, введите 'Да' или 'Нет'.")
 
     if currency_choice == "да":
-        filtered_transactions = [
-            t
-            for t in filtered_transactions
-            if t.get("operationAmount", {}).get("currency", {}).get("code", "").upper() == "RUB"
-        ]
+        query.where_currency("RUB")
 
     while True:
         desc_filter_choice = input(
@@ -204,11 +277,83 @@ def main() -> None:
 
     if desc_filter_choice == "да":
         search_term = input("Введите слово для поиска в описании: Пользователь: ")
-        filtered_transactions = filter_by_description(filtered_transactions, search_term)
+        query.where_description(search_term)
 
     print("Распечатываю итоговый список транзакций...")
-    print_transactions(filtered_transactions)
+    print_transactions(query.run(transactions))
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Пакетная фильтрация банковских транзакций.")
+    parser.add_argument("--input", required=True, help="файл с транзакциями: JSON, JSON Lines, CSV или XLSX")
+    parser.add_argument("--state", help="статус операции, например EXECUTED")
+    parser.add_argument("--currency", help="код валюты, например RUB")
+    parser.add_argument("--search", help="регулярное выражение для поиска в описании")
+    parser.add_argument("--sort", choices=["asc", "desc"], help="сортировка по дате")
+    parser.add_argument("--output", default="-", help="файл для результата в формате JSON Lines (по умолчанию stdout)")
+    return parser.parse_args(argv)
+
+
+def _write_jsonl(records: Iterator[Transaction], output: TextIO) -> int:
+    count = 0
+    for record in records:
+        output.write(json.dumps(record.to_dict(), ensure_ascii=False, default=str))
+        output.write("\n")
+        count += 1
+    return count
+
+
+def run_batch(argv: Optional[Sequence[str]] = None) -> int:
+    """Неинтерактивный режим: фильтрует файл по параметрам командной строки и пишет результат в JSON Lines."""
+    args = parse_args(argv)
+    if not os.path.isfile(args.input):
+        print(f"Ошибка: Файл {args.input} не найден.", file=sys.stderr)
+        return 1
+
+    query = TransactionQuery()
+    if args.state:
+        query.where_state(args.state)
+    if args.currency:
+        query.where_currency(args.currency)
+    if args.search:
+        query.where_description(args.search)
+    if args.sort:
+        query.order_by_date(reverse=args.sort == "desc")
+
+    started = time.perf_counter()
+    try:
+        # XLSX разбирается целиком до начала отбора, JSON и CSV читаются потоково во время отбора
+        transactions = iter_transactions_from_file(args.input, strict=True)
+        load_seconds = time.perf_counter() - started
+        if args.output == "-":
+            written = _write_jsonl(query.iter(transactions), sys.stdout)
+            sys.stdout.flush()
+        else:
+            with open(args.output, "w", encoding="utf-8") as output:
+                written = _write_jsonl(query.iter(transactions), output)
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except Exception as e:
+        print(f"Ошибка при обработке файла {args.input}: {e}", file=sys.stderr)
+        return 1
+    total = time.perf_counter() - started
+
+    stats = query.stats
+    write_seconds = max(total - load_seconds - stats.filter_seconds - stats.sort_seconds, 0.0)
+    print(f"Загрузка файла: {load_seconds:.3f} с", file=sys.stderr)
+    print(
+        f"Чтение и фильтрация: {stats.scanned} строк, отобрано {stats.matched} ({stats.filter_seconds:.3f} с)",
+        file=sys.stderr,
+    )
+    if args.sort:
+        print(f"Сортировка: {stats.matched} строк ({stats.sort_seconds:.3f} с)", file=sys.stderr)
+    print(f"Запись: {written} строк ({write_seconds:.3f} с)", file=sys.stderr)
+    print(f"Всего: {total:.3f} с", file=sys.stderr)
+    return 0
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_batch(sys.argv[1:]))
     main()
@@ -1,18 +1,53 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+import pandas as pd
+
 from src.logger_config import get_logger
 
 logger = get_logger("masks")
 
+MIN_CARD_LENGTH = 6
+CARD_MASK = " **** **** "
+MASK_CACHE_SIZE = 4096
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_mask_caches: Dict[str, Any] = {}
+
+
+def cached_masking(func: F) -> F:
+    """Оборачивает функцию маскировки ограниченным LRU-кэшем и регистрирует его для статистики и очистки"""
+    cached = lru_cache(maxsize=MASK_CACHE_SIZE)(func)
+    _mask_caches[f"{func.__module__}.{func.__qualname__}"] = cached
+    return cached  # type: ignore[return-value]
+
+
+def mask_cache_info() -> Dict[str, Dict[str, Optional[int]]]:
+    """Статистика кэшей маскировки: попадания, промахи, размер и предельный размер"""
+    return {name: cached.cache_info()._asdict() for name, cached in _mask_caches.items()}
+
+
+def clear_mask_cache() -> None:
+    """Очищает все кэши маскировки"""
+    for cached in _mask_caches.values():
+        cached.cache_clear()
+
+
+def _mask_card(card_number: str) -> str:
+    return card_number[:4] + CARD_MASK + card_number[-4:]
+
 
 def mask_credit_card(card_number: str) -> str:
     """Маскирует номер кредитной карты"""
-    logger.info(f"Начало маскировки карты: {card_number}")
+    logger.info("Начало маскировки карты")
 
     try:
-        if len(card_number) < 6:
-            logger.warning(f"Номер карты слишком короткий: {card_number}")
+        if len(card_number) < MIN_CARD_LENGTH:
+            logger.warning(f"Номер карты слишком короткий: {len(card_number)} символов")
             return card_number
 
-        masked = card_number[:4] + " **** **** " + card_number[-4:]
+        masked = _mask_card(card_number)
         logger.info(f"Карта успешно замаскирована: {masked}")
         return masked
 
@@ -21,6 +56,46 @@ def mask_credit_card(card_number: str) -> str:
         raise
 
 
+def mask_many(card_numbers: Iterable[Optional[str]]) -> List[Optional[str]]:
+    """Маскирует последовательность номеров карт так же, как mask_credit_card.
+
+    Пустые значения возвращаются без изменений. На весь вызов пишется одна сводная запись в лог,
+    сами номера в лог не попадают.
+    """
+    result: List[Optional[str]] = []
+    short = 0
+    for card_number in card_numbers:
+        if not card_number:
+            result.append(card_number)
+        elif len(card_number) < MIN_CARD_LENGTH:
+            short += 1
+            result.append(card_number)
+        else:
+            result.append(_mask_card(card_number))
+    if result:
+        logger.info("Пакетная маскировка карт: всего %d, слишком коротких %d", len(result), short)
+    return result
+
+
+def mask_column(card_numbers: pd.Series) -> pd.Series:
+    """Векторная маскировка столбца номеров карт; нестроковые и короткие значения не изменяются"""
+    maskable = pd.Series(False, index=card_numbers.index)
+    masked = card_numbers
+    if pd.api.types.is_object_dtype(card_numbers) or pd.api.types.is_string_dtype(card_numbers):
+        try:
+            text = card_numbers.str
+        except AttributeError:
+            # Столбец object без строковых значений, например целые номера
+            text = None
+        if text is not None:
+            maskable = (text.len() >= MIN_CARD_LENGTH).fillna(False).astype(bool)
+            masked = card_numbers.where(~maskable, text[:4] + CARD_MASK + text[-4:])
+    if len(card_numbers):
+        logger.info("Пакетная маскировка карт: всего %d, замаскировано %d", len(card_numbers), int(maskable.sum()))
+    return masked
+
+
+@cached_masking
 def get_mask_card_number(card_number: str) -> str:
     if not card_number or not card_number.replace(" ", "").isdigit():
         return card_number
@@ -30,6 +105,7 @@ def get_mask_card_number(card_number: str) -> str:
     return f"{cleaned[:6]}{'*' * (len(cleaned) - 10)}{cleaned[-4:]}"
 
 
+@cached_masking
 def get_mask_account(account: str) -> str:
     """Маскирует номер счёта, оставляя последние 4 цифры и сохраняя исходную длину"""
     if not account:
@@ -0,0 +1,148 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar, cast
+
+T = TypeVar("T", bound=Callable[..., Any])
+
+# Границы корзин гистограммы в секундах: от 1 мкс до 100 с, по четыре на порядок
+LATENCY_BUCKETS = tuple(round(10 ** (power / 4), 10) for power in range(-24, 9))
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """Гистограмма длительностей с фиксированными корзинами и оценкой квантилей"""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Оценивает квантиль линейной интерполяцией внутри корзины, как histogram_quantile в Prometheus"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - cumulative) / bucket_count
+                return min(estimate, self.max)
+            cumulative += bucket_count
+        return self.max
+
+
+class FunctionMetrics:
+    """Счётчики вызовов и ошибок функции и гистограмма их длительности"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram()
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_seconds": self.latency.sum,
+            "max_seconds": self.latency.max,
+        }
+        for q in QUANTILES:
+            result[f"p{round(q * 100)}"] = self.latency.quantile(q)
+        return result
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """Потокобезопасный реестр метрик функций с выгрузкой в JSON и текстовый формат Prometheus"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, FunctionMetrics] = {}
+
+    def observe(self, name: str, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            metrics = self._metrics.get(name)
+            if metrics is None:
+                metrics = self._metrics[name] = FunctionMetrics()
+            metrics.calls += 1
+            metrics.errors += error
+            metrics.latency.observe(seconds)
+
+    def get(self, name: str) -> Optional[FunctionMetrics]:
+        return self._metrics.get(name)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: metrics.to_dict() for name, metrics in sorted(self._metrics.items())}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=indent)
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = [
+            "# HELP function_calls_total Число вызовов функции",
+            "# TYPE function_calls_total counter",
+            "# HELP function_errors_total Число вызовов, завершившихся исключением",
+            "# TYPE function_errors_total counter",
+            "# HELP function_duration_seconds Длительность вызова функции",
+            "# TYPE function_duration_seconds histogram",
+        ]
+        with self._lock:
+            for name, metrics in sorted(self._metrics.items()):
+                label = f'function="{_label(name)}"'
+                lines.append(f"function_calls_total{{{label}}} {metrics.calls}")
+                lines.append(f"function_errors_total{{{label}}} {metrics.errors}")
+                histogram = metrics.latency
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f'function_duration_seconds_bucket{{{label},le="{bound:g}"}} {cumulative}')
+                lines.append(f'function_duration_seconds_bucket{{{label},le="+Inf"}} {histogram.count}')
+                lines.append(f"function_duration_seconds_sum{{{label}}} {histogram.sum!r}")
+                lines.append(f"function_duration_seconds_count{{{label}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def timed(name: Optional[str] = None, metrics: Optional[MetricsRegistry] = None) -> Callable[[T], T]:
+    """Записывает в реестр метрик число вызовов, ошибок и длительность каждого вызова функции"""
+
+    def decorator(func: T) -> T:
+        metric_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                (metrics or registry).observe(metric_name, time.perf_counter() - started, error=True)
+                raise
+            (metrics or registry).observe(metric_name, time.perf_counter() - started)
+            return result
+
+        return cast(T, wrapper)
+
+    return decorator
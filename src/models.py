@@ -0,0 +1,123 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+
+def _is_missing(value: Any) -> bool:
+    """Пустое значение поля: None, пустая строка или пропуск pandas (NaN, NaT)"""
+    if value is None or (isinstance(value, str) and not value):
+        return True
+    return bool(pd.api.types.is_scalar(value) and pd.isna(value))
+
+
+def _text(value: Any) -> str:
+    """Строковое значение поля; пустое значение становится пустой строкой"""
+    return "" if _is_missing(value) else str(value)
+
+
+def _parse_id(value: Any) -> Any:
+    """Идентификатор операции; целое число, прочитанное pandas как float, приводится к int"""
+    if _is_missing(value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    """Разбирает дату из строки ISO 8601 или объекта datetime"""
+    if _is_missing(value):
+        return None
+    if isinstance(value, datetime):
+        return value
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _parse_amount(value: Any) -> Optional[float]:
+    """Разбирает сумму операции"""
+    if _is_missing(value):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class FinancialOperation:
+    date: Optional[datetime]
+    description: str
+    amount: Optional[float]
+    category: str = ""
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Transaction(FinancialOperation):
+    """Неизменяемая запись о транзакции, поля которой разобраны один раз при загрузке"""
+
+    id: Any = None
+    state: str = ""
+    currency_code: str = ""
+    currency_name: str = ""
+    from_account: str = ""
+    to_account: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Transaction":
+        """Создаёт запись из словаря любого из форматов загрузчиков"""
+        operation_amount = data.get("operationAmount")
+        if isinstance(operation_amount, dict):
+            amount = operation_amount.get("amount")
+            currency = operation_amount.get("currency")
+            if not isinstance(currency, dict):
+                currency = {}
+            currency_code = _text(currency.get("code"))
+            currency_name = _text(currency.get("name"))
+        else:
+            amount = data.get("amount")
+            currency_code = _text(data.get("currency_code")) or _text(data.get("currency"))
+            currency_name = _text(data.get("currency_name"))
+
+        return cls(
+            id=_parse_id(data.get("id")),
+            date=_parse_datetime(data.get("date")),
+            description=_text(data.get("description")),
+            amount=_parse_amount(amount),
+            category=_text(data.get("category")),
+            state=_text(data.get("state")).upper(),
+            currency_code=currency_code.upper(),
+            currency_name=currency_name,
+            from_account=_text(data.get("from")),
+            to_account=_text(data.get("to")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Возвращает запись в каноническом словарном формате"""
+        result: Dict[str, Any] = {}
+        if self.id is not None:
+            result["id"] = self.id
+        if self.state:
+            result["state"] = self.state
+        if self.date is not None:
+            result["date"] = self.date.isoformat()
+        if self.amount is not None or self.currency_code:
+            result["operationAmount"] = {
+                "amount": f"{self.amount:.2f}" if self.amount is not None else "",
+                "currency": {"name": self.currency_name, "code": self.currency_code},
+            }
+        if self.description:
+            result["description"] = self.description
+        if self.category:
+            result["category"] = self.category
+        if self.from_account:
+            result["from"] = self.from_account
+        if self.to_account:
+            result["to"] = self.to_account
+        return result
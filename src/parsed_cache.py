@@ -0,0 +1,188 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = os.getenv("PARSED_CACHE_DIR", str(Path.home() / ".cache" / "bank_operations"))
+CACHE_MAX_ENTRIES = int(os.getenv("PARSED_CACHE_MAX_ENTRIES", "64"))
+MAGIC = b"TXCACHE1"
+ALIGNMENT = 64
+
+
+class UnsupportedFrameError(Exception):
+    """DataFrame содержит данные, которые нельзя сохранить в колоночном формате кэша"""
+
+
+def _fingerprint(path: Path) -> Dict[str, int]:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _cache_path(path: Path, options: Dict[str, Any]) -> Path:
+    key = json.dumps([str(path.resolve()), options], sort_keys=True, default=str)
+    return Path(CACHE_DIR) / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.txc"
+
+
+def _evict(directory: Path) -> None:
+    """Удаляет давно не использовавшиеся записи кэша сверх CACHE_MAX_ENTRIES"""
+    entries = []
+    for entry in directory.glob("*.txc"):
+        try:
+            entries.append((entry.stat().st_mtime_ns, entry))
+        except OSError:
+            continue
+    entries.sort(reverse=True)
+    for _, entry in entries[CACHE_MAX_ENTRIES:]:
+        try:
+            entry.unlink()
+        except OSError:
+            continue
+
+
+def _encode_column(series: pd.Series) -> Tuple[Dict[str, Any], List[bytes]]:
+    """Раскладывает столбец на описание и набор буферов"""
+    dtype = series.dtype
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        values = series.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy()
+        return {"kind": "datetime", "dtype": values.dtype.str, "tz": str(dtype.tz)}, [values.tobytes()]
+    if pd.api.types.is_datetime64_dtype(dtype) or (
+        pd.api.types.is_numeric_dtype(dtype) and isinstance(dtype, np.dtype)
+    ):
+        values = series.to_numpy()
+        return {"kind": "raw", "dtype": values.dtype.str}, [values.tobytes()]
+
+    values = series.to_numpy(dtype=object)
+    mask = pd.isna(series).to_numpy()
+    if not all(isinstance(value, str) for value in values[~mask]):
+        raise UnsupportedFrameError(f"Столбец {series.name!r} содержит значения разных типов")
+    texts = ["" if missing else value for value, missing in zip(values, mask)]
+    offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+    np.cumsum([len(text) for text in texts], out=offsets[1:])
+    blob = "".join(texts).encode("utf-8")
+    description = {"kind": "string", "dtype": str(dtype)}
+    return description, [offsets.tobytes(), mask.astype(np.uint8).tobytes(), blob]
+
+
+def _decode_column(description: Dict[str, Any], buffers: List[memoryview], rows: int) -> pd.Series:
+    """Восстанавливает столбец из буферов файла кэша"""
+    kind = description["kind"]
+    if kind == "raw":
+        return pd.Series(np.frombuffer(buffers[0], dtype=description["dtype"], count=rows), copy=False)
+    if kind == "datetime":
+        index = pd.DatetimeIndex(np.frombuffer(buffers[0], dtype=description["dtype"], count=rows))
+        return pd.Series(index.tz_localize("UTC").tz_convert(description["tz"]))
+
+    offsets = np.frombuffer(buffers[0], dtype=np.int64, count=rows + 1).tolist()
+    mask = np.frombuffer(buffers[1], dtype=np.uint8, count=rows)
+    text = bytes(buffers[2]).decode("utf-8")
+    texts = [np.nan if missing else text[start:end] for start, end, missing in zip(offsets, offsets[1:], mask)]
+    series: pd.Series = pd.Series(texts, dtype=description["dtype"])
+    return series
+
+
+def save_frame(cache_path: Path, df: pd.DataFrame, fingerprint: Dict[str, int]) -> None:
+    """Записывает DataFrame в колоночный бинарный файл, пригодный для отображения в память"""
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        raise UnsupportedFrameError("Поддерживается только индекс по умолчанию")
+
+    columns: List[Dict[str, Any]] = []
+    chunks: List[bytes] = []
+    for position, name in enumerate(df.columns):
+        description, buffers = _encode_column(df.iloc[:, position])
+        description["name"] = name
+        description["buffers"] = [len(buffer) for buffer in buffers]
+        columns.append(description)
+        chunks.extend(buffers)
+
+    header = json.dumps(
+        {"fingerprint": fingerprint, "rows": len(df), "columns": columns}, ensure_ascii=False, default=str
+    ).encode("utf-8")
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(cache_path.name + f".{os.getpid()}.tmp")
+    with tmp_path.open("wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for chunk in chunks:
+            f.write(b"\0" * (-f.tell() % ALIGNMENT))
+            f.write(chunk)
+    tmp_path.replace(cache_path)
+
+
+def load_frame(cache_path: Path, fingerprint: Dict[str, int]) -> Optional[pd.DataFrame]:
+    """Читает DataFrame из файла кэша; возвращает None, если кэш отсутствует или устарел"""
+    try:
+        with cache_path.open("rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            # Копирование при записи: столбцы остаются изменяемыми, а файл кэша — нетронутым
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return None
+
+    view = memoryview(buffer)
+    header_size = struct.unpack_from("<Q", view, len(MAGIC))[0]
+    start = len(MAGIC) + 8
+    position = start + header_size
+    header = json.loads(bytes(view[start:position]).decode("utf-8"))
+    if header["fingerprint"] != fingerprint:
+        return None
+
+    rows = header["rows"]
+    data: Dict[int, pd.Series] = {}
+    for index, description in enumerate(header["columns"]):
+        buffers = []
+        for size in description["buffers"]:
+            start = position + (-position % ALIGNMENT)
+            position = start + size
+            buffers.append(view[start:position])
+        data[index] = _decode_column(description, buffers, rows)
+
+    df = pd.DataFrame(data, copy=False)
+    df.columns = pd.Index([description["name"] for description in header["columns"]])
+    return df
+
+
+def read_excel_cached(file_path: str, **kwargs: Any) -> pd.DataFrame:
+    """pd.read_excel с прозрачным кэшем разобранных данных.
+
+    Ключ кэша — путь к файлу и параметры чтения, запись считается актуальной, пока у исходного файла
+    не изменились размер и время модификации; устаревшая запись перезаписывается на месте. В каталоге
+    хранится не больше CACHE_MAX_ENTRIES записей, лишние удаляются начиная с давно не использовавшихся.
+    Если кэш недоступен, файл читается как обычно.
+    """
+    path = Path(file_path)
+    try:
+        fingerprint = _fingerprint(path)
+    except OSError:
+        fingerprint = {}
+    if not fingerprint or not CACHE_DIR:
+        df: pd.DataFrame = pd.read_excel(file_path, **kwargs)
+        return df
+
+    cache_path = _cache_path(path, kwargs)
+    try:
+        cached = load_frame(cache_path, fingerprint)
+    except (ValueError, KeyError, TypeError, struct.error):
+        cached = None
+    if cached is not None:
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return cached
+
+    df = pd.read_excel(file_path, **kwargs)
+    try:
+        save_frame(cache_path, df, fingerprint)
+        _evict(cache_path.parent)
+    except (OSError, ValueError, UnsupportedFrameError):
+        pass
+    return df
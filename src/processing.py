@@ -1,13 +1,42 @@
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Union, overload
 
+from src.metrics import timed
+from src.transaction_frame import TransactionFrame
 
-def filter_by_state(data: List[Dict[str, Any]], state: str = "EXECUTED") -> List[Dict[str, Any]]:
+
+@overload
+def filter_by_state(data: TransactionFrame, state: str = "EXECUTED") -> TransactionFrame: ...
+
+
+@overload
+def filter_by_state(data: List[Dict[str, Any]], state: str = "EXECUTED") -> List[Dict[str, Any]]: ...
+
+
+@timed()
+def filter_by_state(
+    data: Union[List[Dict[str, Any]], TransactionFrame], state: str = "EXECUTED"
+) -> Union[List[Dict[str, Any]], TransactionFrame]:
     """Возвращает новый список словарей, содержащий только те словари, у которых ключ
     state соответствует указанному значению"""
+    if isinstance(data, TransactionFrame):
+        return data.filter_by_state(state)
     return [item for item in data if item.get("state") == state]
 
 
-def sort_by_date(data: List[Dict[str, Any]], reverse: bool = True) -> List[Dict[str, Any]]:
+@overload
+def sort_by_date(data: TransactionFrame, reverse: bool = True) -> TransactionFrame: ...
+
+
+@overload
+def sort_by_date(data: List[Dict[str, Any]], reverse: bool = True) -> List[Dict[str, Any]]: ...
+
+
+@timed()
+def sort_by_date(
+    data: Union[List[Dict[str, Any]], TransactionFrame], reverse: bool = True
+) -> Union[List[Dict[str, Any]], TransactionFrame]:
     """Возвращает новый список, отсортированный по дате"""
+    if isinstance(data, TransactionFrame):
+        return data.sort_by_date(reverse)
     return sorted(data, key=lambda x: datetime.fromisoformat(x["date"]), reverse=reverse)
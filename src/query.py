@@ -0,0 +1,103 @@
+import time
+from dataclasses import dataclass
+from datetime import timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from src.filters import SearchMode, description_matcher
+from src.models import Transaction
+
+Predicate = Callable[[Transaction], bool]
+
+CHEAP_COST = 0
+REGEX_COST = 10
+
+
+@dataclass
+class QueryStats:
+    """Статистика последнего выполнения запроса"""
+
+    scanned: int = 0
+    matched: int = 0
+    filter_seconds: float = 0.0
+    sort_seconds: float = 0.0
+
+
+def _date_key(transaction: Transaction) -> Tuple[bool, Any]:
+    """Ключ сортировки по дате: даты с часовым поясом приводятся к UTC, даты без пояса считаются заданными в UTC"""
+    date = transaction.date
+    if date is not None and date.tzinfo is not None:
+        try:
+            date = date.astimezone(timezone.utc).replace(tzinfo=None)
+        except OverflowError:
+            date = date.replace(tzinfo=None)
+    return date is not None, date
+
+
+class TransactionQuery:
+    """Запрос к списку транзакций: условия отбора и порядок сортировки, выполняемые за один проход.
+
+    Условия проверяются от самых дешёвых к самым дорогим, сортируются только отобранные записи.
+    """
+
+    def __init__(self) -> None:
+        self._predicates: List[Tuple[int, Predicate]] = []
+        self._reverse: Optional[bool] = None
+        self.stats = QueryStats()
+
+    def where(self, predicate: Predicate, cost: int = CHEAP_COST) -> "TransactionQuery":
+        """Добавляет произвольное условие с оценкой его стоимости"""
+        self._predicates.append((cost, predicate))
+        return self
+
+    def where_state(self, state: str) -> "TransactionQuery":
+        state = state.upper()
+        return self.where(lambda t: t.state == state)
+
+    def where_currency(self, currency_code: str) -> "TransactionQuery":
+        currency_code = currency_code.upper()
+        return self.where(lambda t: t.currency_code == currency_code)
+
+    def where_description(self, search: Union[str, Sequence[str]], mode: SearchMode = "any") -> "TransactionQuery":
+        """Отбирает транзакции, описание которых соответствует регулярному выражению или терминам без учёта регистра"""
+        matcher = description_matcher(search, mode)
+        return self.where(lambda t: bool(t.description) and matcher(t.description), REGEX_COST)
+
+    def order_by_date(self, reverse: bool = False) -> "TransactionQuery":
+        self._reverse = reverse
+        return self
+
+    def _scan(self, transactions: Iterable[Union[Dict, Transaction]], stats: QueryStats) -> Iterator[Transaction]:
+        """Отбирает подходящие записи, учитывая в статистике только время собственной работы"""
+        predicates = [predicate for _, predicate in sorted(self._predicates, key=lambda item: item[0])]
+        started = time.perf_counter()
+        for item in transactions:
+            stats.scanned += 1
+            transaction = item if isinstance(item, Transaction) else Transaction.from_dict(item)
+            for predicate in predicates:
+                if not predicate(transaction):
+                    break
+            else:
+                stats.matched += 1
+                stats.filter_seconds += time.perf_counter() - started
+                yield transaction
+                started = time.perf_counter()
+        stats.filter_seconds += time.perf_counter() - started
+
+    def run(self, transactions: Iterable[Union[Dict, Transaction]]) -> List[Transaction]:
+        """Выполняет запрос за один проход по данным"""
+        self.stats = QueryStats()
+        result = list(self._scan(transactions, self.stats))
+
+        if self._reverse is not None:
+            started = time.perf_counter()
+            result.sort(key=_date_key, reverse=self._reverse)
+            self.stats.sort_seconds = time.perf_counter() - started
+        return result
+
+    def iter(self, transactions: Iterable[Union[Dict, Transaction]]) -> Iterator[Transaction]:
+        """Выполняет запрос лениво: без сортировки записи отдаются по мере чтения данных"""
+        if self._reverse is not None:
+            yield from self.run(transactions)
+            return
+        self.stats = QueryStats()
+        yield from self._scan(transactions, self.stats)
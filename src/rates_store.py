@@ -0,0 +1,112 @@
+import csv
+import json
+import sqlite3
+from datetime import date, datetime
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Iterable, Iterator, Optional, Tuple, Type, Union
+
+DateLike = Union[str, date, datetime]
+
+
+def _normalize_date(value: DateLike) -> str:
+    """Приводит дату к строке ГГГГ-ММ-ДД"""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return date.fromisoformat(str(value).strip()[:10]).isoformat()
+
+
+class HistoricalRatesStore:
+    """Локальное хранилище исторических курсов валют к рублю на SQLite.
+
+    Курсы лежат в таблице с первичным ключом (currency, date), поэтому поиск курса на дату —
+    это один проход по B-дереву индекса без обращения к сети.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:") -> None:
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rates ("
+            "currency TEXT NOT NULL, date TEXT NOT NULL, rate REAL NOT NULL, "
+            "PRIMARY KEY (currency, date)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def __enter__(self) -> "HistoricalRatesStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return int(self._conn.execute("SELECT COUNT(*) FROM rates").fetchone()[0])
+
+    def add_rates(self, rows: Iterable[Tuple[str, DateLike, Any]]) -> int:
+        """Добавляет курсы (валюта, дата, курс), заменяя существующие на ту же дату"""
+        prepared = ((currency.upper(), _normalize_date(day), float(rate)) for currency, day, rate in rows)
+        with self._conn:
+            cursor = self._conn.executemany("INSERT OR REPLACE INTO rates VALUES (?, ?, ?)", prepared)
+        return cursor.rowcount
+
+    def load_csv(self, file_path: Union[str, Path], delimiter: str = ",") -> int:
+        """Загружает курсы из CSV с колонками date, currency, rate"""
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f, delimiter=delimiter)
+            return self.add_rates((row["currency"], row["date"], row["rate"]) for row in reader)
+
+    def load_json(self, file_path: Union[str, Path]) -> int:
+        """Загружает курсы из JSON.
+
+        Поддерживаются список записей {"date", "currency", "rate"}
+        и словарь вида {"rates": {"2023-01-31": {"USD": 89.5, ...}}} (ключ "rates" необязателен).
+        """
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return self.add_rates(self._iter_json_rows(data))
+
+    @staticmethod
+    def _iter_json_rows(data: Any) -> Iterator[Tuple[str, DateLike, Any]]:
+        if isinstance(data, list):
+            for item in data:
+                yield item["currency"], item["date"], item["rate"]
+            return
+        if not isinstance(data, dict):
+            raise ValueError("Некорректный формат файла курсов")
+        for day, rates in data.get("rates", data).items():
+            for currency, rate in rates.items():
+                yield currency, day, rate
+
+    def get_rate(self, currency: str, on_date: DateLike) -> Optional[float]:
+        """Возвращает курс валюты на дату или последний известный курс до неё"""
+        row = self._conn.execute(
+            "SELECT rate FROM rates WHERE currency = ? AND date <= ? ORDER BY date DESC LIMIT 1",
+            (currency.upper(), _normalize_date(on_date)),
+        ).fetchone()
+        return None if row is None else float(row[0])
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def convert_to_rub_on_date(transaction: dict, store: HistoricalRatesStore) -> float:
+    """Конвертирует сумму транзакции в рубли по курсу на дату транзакции"""
+    amount = float(transaction["amount"])
+    currency = transaction.get("currency", "RUB").upper()
+
+    if currency == "RUB":
+        return amount
+
+    try:
+        rate = store.get_rate(currency, transaction["date"])
+    except (KeyError, ValueError):
+        return 0.0
+    if rate is None:
+        return 0.0
+    return amount * rate
@@ -1,86 +1,153 @@
+import glob
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, List
+from pathlib import Path
+from typing import Any, Dict, Generator, Iterator, List, Optional, Tuple
 
+import numpy as np
+import openpyxl
 import pandas as pd
 
+from src.metrics import timed
+from src.models import Transaction
+from src.parsed_cache import read_excel_cached
+
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
+SKIPPED_ROWS_PREVIEW = 10
+DEFAULT_CHUNKSIZE = 50_000
+REQUIRED_COLUMNS = {"date", "description", "amount"}
+SUPPORTED_EXTENSIONS = (".csv", ".xlsx", ".xls")
 
-@dataclass
-class FinancialOperation:
-    date: datetime
-    description: str
-    amount: float
-    category: str = ""
+OperationColumns = Tuple[pd.Series, List[str], List[float], List[str]]
 
 
-def _convert_df_to_operations(df: pd.DataFrame) -> List[dict]:
-    """Внутренняя функция преобразования DataFrame в список операций"""
-    operations = []
-    required_columns = {"date", "description", "amount"}
+@dataclass
+class FileReport:
+    """Итог чтения одного файла при пакетной загрузке"""
 
-    if not required_columns.issubset(df.columns):
-        missing = required_columns - set(df.columns)
-        logging.error(f"Отсутствуют обязательные колонки: {missing}")
-        return []
+    path: str
+    operations: int = 0
+    error: Optional[str] = None
 
-    for index_val, row in df.iterrows():
-        if isinstance(index_val, (int)):
-            row_index = int(index_val) + 1
-        else:
-            logging.warning(f"Неожиданный тип индекса строки: {type(index_val)}. Пропускаем.")
-            continue
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
-        date_obj: Any = None
-        amount_val: Any = None
 
+def _parse_date_value(value: Any) -> Any:
+    """Поэлементный разбор даты для столбцов, которые не удалось преобразовать целиком"""
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
         try:
-            if pd.isna(row["date"]):
-                logging.warning(f"Пропущена дата в строке {row_index}. Строка будет пропущена.")
-                continue
-
-            try:
-                if isinstance(row["date"], datetime):
-                    date_obj = row["date"]
-                elif isinstance(row["date"], pd.Timestamp):
-                    date_obj = row["date"].to_pydatetime()
-                elif isinstance(row["date"], str):
-                    date_obj = datetime.fromisoformat(row["date"])
-                else:
-                    logging.warning(
-                        f"Неожиданный тип даты в строке {row_index}: {type(row['date'])}. Строка будет пропущена."
-                    )
-                    continue
-
-            except (ValueError, TypeError, AttributeError) as e:
-                logging.warning(f"Ошибка парсинга даты в строке {row_index}: {e}. Строка будет пропущена.")
-                continue
-
-            if pd.isna(row["amount"]):
-                logging.warning(f"Пропущена сумма в строке {row_index}. Строка будет пропущена.")
-                continue
-
-            try:
-                amount_val = float(row["amount"])
-            except (ValueError, TypeError) as e:
-                logging.warning(f"Ошибка преобразования суммы в строке {row_index}: {e}. Строка будет пропущена.")
-                continue
-
-            operations.append(
-                {
-                    "date": date_obj,
-                    "description": str(row["description"]),
-                    "amount": amount_val,
-                    "category": str(row.get("category", "")),
-                }
-            )
-        except Exception as e:
-            logging.warning(f"Неожиданная ошибка обработки строки {row_index}: {e}. Строка будет пропущена.")
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return pd.NaT
+    return pd.NaT
+
+
+def _coerce_dates(column: pd.Series) -> pd.Series:
+    """Преобразует столбец в даты, некорректные значения заменяются на NaT.
+
+    Однородный столбец остаётся в типе datetime64, столбец со смешанными часовыми поясами — объектами datetime.
+    """
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column
+    if pd.api.types.is_numeric_dtype(column):
+        return pd.Series(pd.NaT, index=column.index, dtype=object)
+    try:
+        return pd.to_datetime(column, errors="coerce", format="ISO8601")
+    except (ValueError, TypeError):
+        return column.map(_parse_date_value).astype(object)
+
+
+def _dates_to_list(dates: pd.Series) -> List[Any]:
+    """Список объектов datetime из столбца дат"""
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return list(dates.dt.to_pydatetime())
+    return dates.tolist()
+
+
+def _log_skipped_rows(skipped: Dict[str, pd.Index], total: int) -> None:
+    """Пишет одну сводную запись о пропущенных строках"""
+    reasons = []
+    for reason, index in skipped.items():
+        if len(index) == 0:
             continue
+        rows = ", ".join(str(int(i) + 1) for i in index[:SKIPPED_ROWS_PREVIEW])
+        if len(index) > SKIPPED_ROWS_PREVIEW:
+            rows += ", ..."
+        reasons.append(f"{reason}: {len(index)} (строки {rows})")
+    if reasons:
+        skipped_count = sum(len(index) for index in skipped.values())
+        logging.warning(f"Пропущено строк: {skipped_count} из {total}. " + "; ".join(reasons))
+
+
+def _convert_df_to_columns(df: pd.DataFrame) -> OperationColumns:
+    """Проверяет строки DataFrame и возвращает столбцы корректных операций: даты, описания, суммы, категории"""
+    if not REQUIRED_COLUMNS.issubset(df.columns):
+        missing = REQUIRED_COLUMNS - set(df.columns)
+        logging.error(f"Отсутствуют обязательные колонки: {missing}")
+        return pd.Series(dtype=object), [], [], []
+
+    if not pd.api.types.is_integer_dtype(df.index):
+        logging.warning(f"Неожиданный тип индекса строк: {df.index.dtype}. Строки будут пропущены.")
+        return pd.Series(dtype=object), [], [], []
+
+    date_missing = df["date"].isna()
+    dates = _coerce_dates(df["date"])
+    date_invalid = dates.isna() & ~date_missing
+
+    amount_missing = df["amount"].isna()
+    amounts = pd.to_numeric(df["amount"], errors="coerce")
+    amount_invalid = amounts.isna() & ~amount_missing
 
-    return operations
+    skipped: Dict[str, pd.Index] = {}
+    rejected = pd.Series(False, index=df.index)
+    for reason, mask in (
+        ("нет даты", date_missing),
+        ("некорректная дата", date_invalid),
+        ("нет суммы", amount_missing),
+        ("некорректная сумма", amount_invalid),
+    ):
+        current = mask & ~rejected
+        skipped[reason] = df.index[current]
+        rejected |= current
+    _log_skipped_rows(skipped, len(df))
+
+    valid = ~rejected
+    if "category" in df.columns:
+        categories = df.loc[valid, "category"].map(str).tolist()
+    else:
+        categories = [""] * int(valid.sum())
+
+    return (
+        dates[valid],
+        df.loc[valid, "description"].map(str).tolist(),
+        amounts[valid].astype(float).tolist(),
+        categories,
+    )
+
+
+def _columns_to_operations(
+    dates: List[Any], descriptions: List[str], amounts: List[float], categories: List[str]
+) -> List[dict]:
+    return [
+        {"date": date_obj, "description": description, "amount": amount_val, "category": category}
+        for date_obj, description, amount_val, category in zip(dates, descriptions, amounts, categories)
+    ]
+
+
+def _convert_df_to_operations(df: pd.DataFrame) -> List[dict]:
+    """Внутренняя функция преобразования DataFrame в список операций"""
+    dates, descriptions, amounts, categories = _convert_df_to_columns(df)
+    return _columns_to_operations(_dates_to_list(dates), descriptions, amounts, categories)
 
 
 def read_csv_file(file_path: str) -> List[dict]:
@@ -102,7 +169,7 @@ def read_csv_file(file_path: str) -> List[dict]:
 def read_excel_file(file_path: str) -> List[dict]:
     """Чтение финансовых операций из Excel файла"""
     try:
-        df = pd.read_excel(file_path, engine="openpyxl", parse_dates=["date"])
+        df = read_excel_cached(file_path, engine="openpyxl", parse_dates=["date"])
         return _convert_df_to_operations(df)
     except FileNotFoundError:
         logging.info(f"Файл не найден: {file_path}")
@@ -112,6 +179,7 @@ def read_excel_file(file_path: str) -> List[dict]:
         return []
 
 
+@timed()
 def read_financial_file(file_path: str) -> List[dict]:
     """Основная функция для чтения финансовых файлов"""
     if not isinstance(file_path, str):
@@ -126,3 +194,173 @@ def read_financial_file(file_path: str) -> List[dict]:
     else:
         logging.info("Поддерживаются только CSV и Excel файлы.")
         return []
+
+
+def read_financial_records(file_path: str) -> List[Transaction]:
+    """Читает финансовый файл и возвращает операции в виде записей Transaction"""
+    return [Transaction.from_dict(operation) for operation in read_financial_file(file_path)]
+
+
+def iter_csv_file(file_path: str, chunksize: int = DEFAULT_CHUNKSIZE) -> Generator[List[dict], None, None]:
+    """Потоковое чтение финансовых операций из CSV файла пачками по chunksize строк"""
+    try:
+        with pd.read_csv(file_path, chunksize=chunksize) as reader:
+            for chunk in reader:
+                if not REQUIRED_COLUMNS.issubset(chunk.columns):
+                    _convert_df_to_operations(chunk)
+                    return
+                operations = _convert_df_to_operations(chunk)
+                if operations:
+                    yield operations
+    except FileNotFoundError:
+        logging.info(f"Файл не найден: {file_path}")
+    except pd.errors.EmptyDataError:
+        logging.info(f"CSV файл пуст или содержит только заголовки: {file_path}")
+    except Exception as e:
+        logging.error(f"Ошибка чтения CSV файла '{file_path}': {e}")
+
+
+def iter_excel_file(file_path: str, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[List[dict]]:
+    """Потоковое чтение финансовых операций из Excel файла в режиме read_only пачками по chunksize строк"""
+    try:
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    except FileNotFoundError:
+        logging.info(f"Файл не найден: {file_path}")
+        return
+    except Exception as e:
+        logging.error(f"Ошибка чтения Excel файла '{file_path}': {e}")
+        return
+
+    try:
+        sheet = workbook.active
+        if sheet is None or not hasattr(sheet, "iter_rows"):
+            return
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(name) if name is not None else "" for name in header]
+        if not REQUIRED_COLUMNS.issubset(columns):
+            _convert_df_to_operations(pd.DataFrame(columns=columns))
+            return
+
+        offset = 0
+        batch: List[tuple] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == chunksize:
+                operations = _convert_df_to_operations(_rows_to_df(batch, columns, offset))
+                offset += len(batch)
+                batch = []
+                if operations:
+                    yield operations
+        if batch:
+            operations = _convert_df_to_operations(_rows_to_df(batch, columns, offset))
+            if operations:
+                yield operations
+    except Exception as e:
+        logging.error(f"Ошибка чтения Excel файла '{file_path}': {e}")
+    finally:
+        workbook.close()
+
+
+def _rows_to_df(rows: List[tuple], columns: List[str], offset: int) -> pd.DataFrame:
+    """Собирает пачку строк листа в DataFrame со сквозной нумерацией строк"""
+    width = len(columns)
+    padded = [tuple(row[:width]) + (None,) * (width - len(row)) for row in rows]
+    return pd.DataFrame(padded, columns=columns, index=pd.RangeIndex(offset, offset + len(rows)))
+
+
+def iter_financial_file(file_path: str, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[List[dict]]:
+    """Потоковое чтение финансового файла: возвращает операции пачками, не загружая файл целиком"""
+    if not isinstance(file_path, str):
+        logging.error("Путь к файлу должен быть строкой.")
+        return iter(())
+
+    file_path_lower = file_path.lower()
+    if file_path_lower.endswith(".csv"):
+        return iter_csv_file(file_path, chunksize)
+    elif file_path_lower.endswith((".xlsx", ".xls")):
+        return iter_excel_file(file_path, chunksize)
+    else:
+        logging.info("Поддерживаются только CSV и Excel файлы.")
+        return iter(())
+
+
+def collect_financial_files(source: str) -> List[str]:
+    """Возвращает отсортированный список CSV и Excel файлов из каталога, по шаблону glob или один файл"""
+    path = Path(source)
+    if path.is_dir():
+        candidates = [str(child) for child in path.iterdir() if child.is_file()]
+    elif path.is_file():
+        return [source]
+    else:
+        candidates = glob.glob(source, recursive=True)
+    return sorted(name for name in candidates if name.lower().endswith(SUPPORTED_EXTENSIONS))
+
+
+def _read_file_strict(file_path: str) -> OperationColumns:
+    """Читает файл целиком, сообщая об ошибках исключениями, а не записью в лог"""
+    if file_path.lower().endswith(".csv"):
+        df = pd.read_csv(file_path, parse_dates=["date"])
+    else:
+        df = read_excel_cached(file_path, engine="openpyxl", parse_dates=["date"])
+    missing = REQUIRED_COLUMNS - set(df.columns)
+    if missing:
+        raise ValueError(f"Отсутствуют обязательные колонки: {sorted(missing)}")
+    return _convert_df_to_columns(df)
+
+
+def _read_file_task(file_path: str) -> Tuple[Optional[Tuple[Any, ...]], Optional[str]]:
+    """Задача для процесса-исполнителя: столбцы операций в компактном виде или текст ошибки.
+
+    Даты без часового пояса и суммы передаются массивами numpy: их сериализация между процессами
+    на порядок дешевле, чем у списка словарей с объектами datetime.
+    """
+    try:
+        dates, descriptions, amounts, categories = _read_file_strict(file_path)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    packed_dates: Any
+    if isinstance(dates.dtype, np.dtype) and dates.dtype.kind == "M":
+        packed_dates = dates.to_numpy(dtype="datetime64[us]")
+    else:
+        packed_dates = _dates_to_list(dates)
+    return (packed_dates, descriptions, np.array(amounts, dtype=np.float64), categories), None
+
+
+def _unpack_operations(packed: Tuple[Any, ...]) -> List[dict]:
+    dates, descriptions, amounts, categories = packed
+    if isinstance(dates, np.ndarray):
+        dates = dates.astype(object).tolist()
+    return _columns_to_operations(dates, descriptions, amounts.tolist(), categories)
+
+
+@timed()
+def read_financial_files(source: str, max_workers: Optional[int] = None) -> Tuple[List[dict], List[FileReport]]:
+    """Параллельно читает все финансовые файлы из каталога или по шаблону glob.
+
+    Файлы разбираются в пуле из max_workers процессов (по умолчанию — по числу ядер), операции
+    объединяются в порядке отсортированных путей. Для каждого файла возвращается отчёт с числом
+    операций или текстом ошибки.
+    """
+    paths = collect_financial_files(source)
+    workers = min(max_workers or os.cpu_count() or 1, len(paths))
+
+    if workers <= 1:
+        results = [_read_file_task(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_read_file_task, paths))
+
+    operations: List[dict] = []
+    reports: List[FileReport] = []
+    for path, (packed, error) in zip(paths, results):
+        if packed is None:
+            logging.error(f"Ошибка чтения файла '{path}': {error}")
+            reports.append(FileReport(path=path, error=error))
+            continue
+        file_operations = _unpack_operations(packed)
+        operations.extend(file_operations)
+        reports.append(FileReport(path=path, operations=len(file_operations)))
+    return operations, reports
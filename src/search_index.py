@@ -0,0 +1,279 @@
+import re
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Type, TypeVar, Union, overload
+
+import numpy as np
+
+from src.filters import REGEX_METACHARACTERS, description_matcher
+from src.models import Transaction
+from src.transaction_frame import TransactionFrame
+
+TOKEN_PATTERN = re.compile(r"\w+")
+PREFIX_END = chr(0x10FFFF)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+DEFAULT_SIMILARITY = 0.3
+
+IndexT = TypeVar("IndexT", bound="_RowIndex")
+
+
+def _tokens(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _intersect(postings: List[np.ndarray]) -> np.ndarray:
+    """Пересекает отсортированные списки номеров строк, начиная с самого короткого.
+
+    Каждый элемент короткого списка ищется в длинном двоичным поиском, поэтому стоимость зависит
+    от размера наименьшего списка, а не от числа строк.
+    """
+    postings.sort(key=len)
+    result = postings[0]
+    for other in postings[1:]:
+        if not len(result):
+            break
+        positions = np.minimum(np.searchsorted(other, result), len(other) - 1)
+        result = result[other[positions] == result]
+    return result
+
+
+def _descriptions_of(
+    transactions: Union[Sequence[Union[Dict, Transaction]], TransactionFrame],
+) -> Iterable[Optional[str]]:
+    if isinstance(transactions, TransactionFrame):
+        descriptions: List[Optional[str]] = transactions.descriptions.tolist()
+        return descriptions
+    return (
+        (transaction.description or None) if isinstance(transaction, Transaction) else transaction.get("description")
+        for transaction in transactions
+    )
+
+
+class _RowIndex(ABC):
+    """Общая часть индексов по описаниям: номера строк совпадают с позициями транзакций в исходных данных"""
+
+    def __init__(self, descriptions: Iterable[Optional[str]] = ()) -> None:
+        self.extend(descriptions)
+
+    @classmethod
+    def from_transactions(
+        cls: Type[IndexT], transactions: Union[Sequence[Union[Dict, Transaction]], TransactionFrame]
+    ) -> IndexT:
+        """Строит индекс по описаниям загруженных транзакций"""
+        index = cls()
+        index.append_transactions(transactions)
+        return index
+
+    @abstractmethod
+    def append(self, description: Optional[str]) -> int:
+        """Добавляет строку в конец индекса и возвращает её номер"""
+
+    def extend(self, descriptions: Iterable[Optional[str]]) -> None:
+        for description in descriptions:
+            self.append(description)
+
+    def append_transactions(self, transactions: Union[Sequence[Union[Dict, Transaction]], TransactionFrame]) -> None:
+        """Дописывает в индекс описания новых транзакций"""
+        self.extend(_descriptions_of(transactions))
+
+    @overload
+    def select(self, transactions: TransactionFrame, rows: np.ndarray) -> TransactionFrame: ...
+
+    @overload
+    def select(self, transactions: Sequence[Any], rows: np.ndarray) -> List[Any]: ...
+
+    def select(
+        self, transactions: Union[Sequence[Any], TransactionFrame], rows: np.ndarray
+    ) -> Union[List[Any], TransactionFrame]:
+        """Выбирает найденные строки из последовательности, по которой построен индекс"""
+        if isinstance(transactions, TransactionFrame):
+            return transactions.take(rows)
+        return [transactions[row] for row in rows.tolist()]
+
+
+class DescriptionIndex(_RowIndex):
+    """Инвертированный индекс по словам описаний транзакций: слово → возрастающий список номеров строк.
+
+    Номера строк совпадают с позициями транзакций в исходной последовательности. Индекс поддерживает
+    поиск по словам и префиксам, дозапись новых строк и поиск по регулярному выражению полным просмотром.
+    """
+
+    def __init__(self, descriptions: Iterable[Optional[str]] = ()) -> None:
+        self._descriptions: List[Optional[str]] = []
+        self._postings: Dict[str, array] = {}
+        # Словарь дополняется в конце и сортируется при первом поиске по префиксу после дозаписи
+        self._vocabulary: List[str] = []
+        self._vocabulary_sorted = True
+        super().__init__(descriptions)
+
+    def __len__(self) -> int:
+        return len(self._descriptions)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._vocabulary)
+
+    def append(self, description: Optional[str]) -> int:
+        """Добавляет строку в конец индекса и возвращает её номер"""
+        row = len(self._descriptions)
+        self._descriptions.append(description)
+        if description:
+            for token in set(_tokens(description)):
+                posting = self._postings.get(token)
+                if posting is None:
+                    posting = self._postings[token] = array("I")
+                    self._vocabulary.append(token)
+                    self._vocabulary_sorted = False
+                posting.append(row)
+        return row
+
+    def _posting(self, token: str) -> np.ndarray:
+        posting = self._postings.get(token)
+        return np.array(posting, dtype=np.intp) if posting is not None else np.empty(0, dtype=np.intp)
+
+    def lookup(self, word: str) -> np.ndarray:
+        """Номера строк, описание которых содержит слово целиком (без учёта регистра)"""
+        return self._posting(word.lower())
+
+    def lookup_prefix(self, prefix: str) -> np.ndarray:
+        """Номера строк, описание которых содержит слово, начинающееся с prefix"""
+        if not self._vocabulary_sorted:
+            self._vocabulary.sort()
+            self._vocabulary_sorted = True
+        prefix = prefix.lower()
+        start = bisect_left(self._vocabulary, prefix)
+        end = bisect_left(self._vocabulary, prefix + PREFIX_END, start)
+        if end - start <= 1:
+            return self._posting(self._vocabulary[start]) if end > start else np.empty(0, dtype=np.intp)
+        postings = [np.frombuffer(self._postings[token], dtype=np.uint32) for token in self._vocabulary[start:end]]
+        return np.unique(np.concatenate(postings)).astype(np.intp)
+
+    def search(self, query: str, prefix: bool = True) -> np.ndarray:
+        """Номера строк, содержащих все слова запроса; при prefix=True слова запроса считаются началами слов"""
+        words = _tokens(query)
+        if not words:
+            return np.arange(len(self), dtype=np.intp)
+        find = self.lookup_prefix if prefix else self.lookup
+        return _intersect([find(word) for word in words])
+
+    def search_regex(self, pattern: str) -> np.ndarray:
+        """Поиск по регулярному выражению без учёта регистра полным просмотром описаний"""
+        matcher = description_matcher(pattern)
+        return np.fromiter(
+            (row for row, description in enumerate(self._descriptions) if description and matcher(description)),
+            dtype=np.intp,
+        )
+
+    def find(self, query: str) -> np.ndarray:
+        """Поиск по словам через индекс; запрос с метасимволами регулярных выражений выполняется просмотром"""
+        if REGEX_METACHARACTERS.intersection(query):
+            return self.search_regex(query)
+        return self.search(query)
+
+
+def _normalize(text: str) -> str:
+    return WHITESPACE_PATTERN.sub(" ", text.lower()).strip()
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[start:end] for start, end in zip(range(len(text) - 2), range(3, len(text) + 1))}
+
+
+class TrigramIndex(_RowIndex):
+    """Триграммный индекс описаний для поиска по подстроке и нечёткого поиска с ранжированием по сходству.
+
+    Описания приводятся к нижнему регистру, пробельные символы схлопываются. Одинаковые описания хранятся
+    один раз, списки триграмм ссылаются на уникальные описания, а не на строки.
+    """
+
+    def __init__(self, descriptions: Iterable[Optional[str]] = ()) -> None:
+        self._texts: List[str] = []
+        self._text_ids: Dict[str, int] = {}
+        self._text_rows: List[array] = []
+        self._text_sizes = array("I")
+        self._postings: Dict[str, array] = {}
+        self._rows = 0
+        super().__init__(descriptions)
+
+    def __len__(self) -> int:
+        return self._rows
+
+    @property
+    def distinct_descriptions(self) -> int:
+        return len(self._texts)
+
+    def append(self, description: Optional[str]) -> int:
+        """Добавляет строку в конец индекса и возвращает её номер"""
+        row = self._rows
+        self._rows += 1
+        if not description:
+            return row
+        text = _normalize(description)
+        text_id = self._text_ids.get(text)
+        if text_id is None:
+            text_id = self._text_ids[text] = len(self._texts)
+            self._texts.append(text)
+            self._text_rows.append(array("I"))
+            trigrams = _trigrams(f" {text} ")
+            self._text_sizes.append(len(trigrams))
+            for trigram in trigrams:
+                self._postings.setdefault(trigram, array("I")).append(text_id)
+        self._text_rows[text_id].append(row)
+        return row
+
+    def _rows_of(self, text_ids: Iterable[int]) -> np.ndarray:
+        rows = [np.frombuffer(self._text_rows[text_id], dtype=np.uint32).astype(np.intp) for text_id in text_ids]
+        return np.concatenate(rows) if rows else np.empty(0, dtype=np.intp)
+
+    def _candidates(self, query: str) -> np.ndarray:
+        """Уникальные описания, которые могут содержать подстроку query"""
+        if len(query) >= 3:
+            postings = []
+            for trigram in _trigrams(query):
+                posting = self._postings.get(trigram)
+                if posting is None:
+                    return np.empty(0, dtype=np.intp)
+                postings.append(np.array(posting, dtype=np.intp))
+            return _intersect(postings)
+        matching = [
+            np.array(posting, dtype=np.intp) for trigram, posting in self._postings.items() if query in trigram
+        ]
+        return np.unique(np.concatenate(matching)) if matching else np.empty(0, dtype=np.intp)
+
+    def search_substring(self, query: str) -> np.ndarray:
+        """Номера строк, описание которых содержит подстроку query без учёта регистра.
+
+        Кандидаты отбираются пересечением списков триграмм запроса и затем проверяются по тексту.
+        """
+        query = WHITESPACE_PATTERN.sub(" ", query.lower())
+        if not query:
+            return np.arange(len(self), dtype=np.intp)
+        found = [text_id for text_id in self._candidates(query).tolist() if query in self._texts[text_id]]
+        return np.sort(self._rows_of(found))
+
+    def search_fuzzy(
+        self, query: str, threshold: float = DEFAULT_SIMILARITY, limit: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Нечёткий поиск: номера строк и их сходство с запросом по убыванию сходства.
+
+        Сходство — коэффициент Жаккара по множествам триграмм; в результат попадают описания
+        со сходством не ниже threshold, limit ограничивает число уникальных описаний.
+        """
+        trigrams = _trigrams(f" {_normalize(query)} ")
+        postings = [np.array(self._postings[t], dtype=np.intp) for t in trigrams if t in self._postings]
+        if not postings:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+
+        text_ids, shared = np.unique(np.concatenate(postings), return_counts=True)
+        sizes = np.frombuffer(self._text_sizes, dtype=np.uint32)[text_ids]
+        similarity = shared / (len(trigrams) + sizes - shared)
+        keep = similarity >= threshold
+        text_ids, similarity = text_ids[keep], similarity[keep]
+        order = np.argsort(-similarity, kind="stable")[:limit]
+
+        rows = [np.frombuffer(self._text_rows[text_id], dtype=np.uint32) for text_id in text_ids[order].tolist()]
+        if not rows:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+        counts = [len(row_ids) for row_ids in rows]
+        return np.concatenate(rows).astype(np.intp), np.repeat(similarity[order], counts)
@@ -0,0 +1,245 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+AMOUNT_SCALE = 100
+MISSING = np.iinfo(np.int64).min
+MAX_AMOUNT = np.iinfo(np.int64).max
+NAIVE = np.iinfo(np.int32).min
+EPOCH = datetime(1970, 1, 1)
+
+
+def _parse_date(value: Any) -> Tuple[int, int]:
+    """Переводит дату ISO 8601 в число микросекунд UTC от начала эпохи и смещение часового пояса в секундах.
+
+    Для даты без часового пояса смещение равно NAIVE, а время считается заданным в UTC.
+    """
+    try:
+        date_obj = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+        offset = date_obj.utcoffset()
+        if offset is not None:
+            date_obj = date_obj.astimezone(timezone.utc).replace(tzinfo=None)
+    except (ValueError, OverflowError):
+        return MISSING, NAIVE
+    return (date_obj - EPOCH) // timedelta(microseconds=1), NAIVE if offset is None else offset // timedelta(seconds=1)
+
+
+def _format_date(micros: int, offset: int) -> str:
+    """Восстанавливает дату ISO 8601 с исходным смещением часового пояса"""
+    date_obj = EPOCH + timedelta(microseconds=micros)
+    if offset != NAIVE:
+        date_obj = date_obj.replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(seconds=offset)))
+    return date_obj.isoformat(timespec="microseconds")
+
+
+def _parse_amount(value: Any) -> int:
+    """Переводит сумму в целое число сотых долей с банковским округлением до двух знаков.
+
+    Нечисловые, бесконечные и не помещающиеся в int64 значения считаются отсутствующими.
+    """
+    try:
+        amount = int((Decimal(str(value)) * AMOUNT_SCALE).to_integral_value())
+    except (InvalidOperation, ValueError, OverflowError):
+        return MISSING
+    return amount if MISSING < amount <= MAX_AMOUNT else MISSING
+
+
+def _encode(values: Iterable[Optional[str]], categories: List[str], dtype: Any) -> np.ndarray:
+    """Кодирует строки индексами в списке категорий, отсутствующие значения — числом -1"""
+    lookup = {name: code for code, name in enumerate(categories)}
+    codes = []
+    for value in values:
+        if value is None:
+            codes.append(-1)
+            continue
+        if value not in lookup:
+            lookup[value] = len(categories)
+            categories.append(value)
+        codes.append(lookup[value])
+    return np.array(codes, dtype=dtype)
+
+
+class TransactionFrame:
+    """Колоночное хранилище транзакций.
+
+    Даты хранятся как int64 микросекунд UTC от начала эпохи вместе с исходным смещением часового пояса,
+    суммы — как int64 сотых долей (округление до двух знаков), статус и валюта — как коды категорий.
+    Фильтрация и сортировка выполняются над массивами numpy.
+    """
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        dates: np.ndarray,
+        tz_offsets: np.ndarray,
+        amounts: np.ndarray,
+        state_codes: np.ndarray,
+        states: List[str],
+        currency_codes: np.ndarray,
+        currencies: List[str],
+        currency_names: Dict[str, str],
+        descriptions: np.ndarray,
+        from_accounts: np.ndarray,
+        to_accounts: np.ndarray,
+    ) -> None:
+        self.ids = ids
+        self.dates = dates
+        self.tz_offsets = tz_offsets
+        self.amounts = amounts
+        self.state_codes = state_codes
+        self.states = states
+        self.currency_codes = currency_codes
+        self.currencies = currencies
+        self.currency_names = currency_names
+        self.descriptions = descriptions
+        self.from_accounts = from_accounts
+        self.to_accounts = to_accounts
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "TransactionFrame":
+        """Строит таблицу из списка словарей в привычном формате транзакций"""
+        ids: List[Any] = []
+        dates: List[int] = []
+        tz_offsets: List[int] = []
+        amounts: List[int] = []
+        states: List[Optional[str]] = []
+        currencies: List[Optional[str]] = []
+        currency_names: Dict[str, str] = {}
+        descriptions: List[Optional[str]] = []
+        from_accounts: List[Optional[str]] = []
+        to_accounts: List[Optional[str]] = []
+
+        for record in records:
+            operation_amount = record.get("operationAmount")
+            if isinstance(operation_amount, dict):
+                amount = operation_amount.get("amount")
+                currency = operation_amount.get("currency") or {}
+                code = currency.get("code")
+                if code is not None and currency.get("name") is not None:
+                    currency_names.setdefault(code, currency["name"])
+            else:
+                amount = record.get("amount")
+                code = record.get("currency")
+
+            ids.append(record.get("id"))
+            date, tz_offset = (MISSING, NAIVE) if record.get("date") is None else _parse_date(record["date"])
+            dates.append(date)
+            tz_offsets.append(tz_offset)
+            amounts.append(MISSING if amount is None else _parse_amount(amount))
+            states.append(record.get("state"))
+            currencies.append(code)
+            descriptions.append(record.get("description"))
+            from_accounts.append(record.get("from"))
+            to_accounts.append(record.get("to"))
+
+        state_categories: List[str] = []
+        currency_categories: List[str] = []
+        return cls(
+            ids=np.array(ids, dtype=object),
+            dates=np.array(dates, dtype=np.int64),
+            tz_offsets=np.array(tz_offsets, dtype=np.int32),
+            amounts=np.array(amounts, dtype=np.int64),
+            state_codes=_encode(states, state_categories, np.int16),
+            states=state_categories,
+            currency_codes=_encode(currencies, currency_categories, np.int16),
+            currencies=currency_categories,
+            currency_names=currency_names,
+            descriptions=np.array(descriptions, dtype=object),
+            from_accounts=np.array(from_accounts, dtype=object),
+            to_accounts=np.array(to_accounts, dtype=object),
+        )
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Возвращает транзакции в виде списка словарей в каноническом формате"""
+        return list(self)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self._record(i)
+
+    def _record(self, i: int) -> Dict[str, Any]:
+        record: Dict[str, Any] = {}
+        if self.ids[i] is not None:
+            record["id"] = self.ids[i]
+        if self.state_codes[i] >= 0:
+            record["state"] = self.states[self.state_codes[i]]
+        if self.dates[i] != MISSING:
+            record["date"] = _format_date(int(self.dates[i]), int(self.tz_offsets[i]))
+        if self.amounts[i] != MISSING or self.currency_codes[i] >= 0:
+            operation_amount: Dict[str, Any] = {}
+            if self.amounts[i] != MISSING:
+                operation_amount["amount"] = str(Decimal(int(self.amounts[i])).scaleb(-2))
+            if self.currency_codes[i] >= 0:
+                code = self.currencies[self.currency_codes[i]]
+                operation_amount["currency"] = {"name": self.currency_names.get(code, code), "code": code}
+            record["operationAmount"] = operation_amount
+        for key, column in (
+            ("description", self.descriptions),
+            ("from", self.from_accounts),
+            ("to", self.to_accounts),
+        ):
+            if column[i] is not None:
+                record[key] = column[i]
+        return record
+
+    def take(self, indices: Union[Sequence[int], np.ndarray]) -> "TransactionFrame":
+        """Возвращает новую таблицу из строк с указанными номерами"""
+        index = np.asarray(indices, dtype=np.intp)
+        return TransactionFrame(
+            ids=self.ids[index],
+            dates=self.dates[index],
+            tz_offsets=self.tz_offsets[index],
+            amounts=self.amounts[index],
+            state_codes=self.state_codes[index],
+            states=self.states,
+            currency_codes=self.currency_codes[index],
+            currencies=self.currencies,
+            currency_names=self.currency_names,
+            descriptions=self.descriptions[index],
+            from_accounts=self.from_accounts[index],
+            to_accounts=self.to_accounts[index],
+        )
+
+    def where(self, mask: np.ndarray) -> "TransactionFrame":
+        """Возвращает новую таблицу из строк, для которых маска истинна"""
+        return self.take(np.flatnonzero(mask))
+
+    def _category_mask(self, codes: np.ndarray, categories: List[str], value: str) -> np.ndarray:
+        if value not in categories:
+            return np.zeros(len(self), dtype=bool)
+        mask: np.ndarray = codes == categories.index(value)
+        return mask
+
+    def state_mask(self, state: str) -> np.ndarray:
+        return self._category_mask(self.state_codes, self.states, state)
+
+    def currency_mask(self, currency: str) -> np.ndarray:
+        return self._category_mask(self.currency_codes, self.currencies, currency)
+
+    def date_order(self, reverse: bool = False) -> np.ndarray:
+        """Стабильный порядок строк по дате; строки без даты считаются самыми ранними"""
+        if not reverse:
+            return np.argsort(self.dates, kind="stable")
+        backward = np.argsort(self.dates[::-1], kind="stable")[::-1]
+        return len(self) - 1 - backward
+
+    def filter_by_state(self, state: str) -> "TransactionFrame":
+        return self.where(self.state_mask(state))
+
+    def filter_by_currency(self, currency: str) -> "TransactionFrame":
+        return self.where(self.currency_mask(currency))
+
+    def sort_by_date(self, reverse: bool = False) -> "TransactionFrame":
+        return self.take(self.date_order(reverse))
+
+    @property
+    def amounts_float(self) -> np.ndarray:
+        """Суммы в виде float, отсутствующие — NaN"""
+        result = self.amounts.astype(np.float64) / AMOUNT_SCALE
+        result[self.amounts == MISSING] = np.nan
+        return result
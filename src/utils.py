@@ -1,8 +1,10 @@
 import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, Iterator, List
 
 from src.logger_config import get_logger
+from src.metrics import timed
+from src.models import Transaction
 
 logger = get_logger("utils")
 
@@ -22,6 +24,7 @@ def format_phone_number(phone: str) -> str:
         raise
 
 
+@timed()
 def load_transactions(file_path: str) -> List[Dict[str, Any]]:
     """Загружает транзакции из JSON файла с полной обработкой ошибок."""
     path = Path(file_path)
@@ -39,3 +42,98 @@ def load_transactions(file_path: str) -> List[Dict[str, Any]]:
         return []
     except OSError:
         return []
+
+
+def _iter_json_array(f: IO[str], buffer: str, pos: int, chunk_size: int) -> Iterator[Any]:
+    """Последовательно декодирует элементы JSON-массива, дочитывая файл по мере необходимости"""
+    decoder = json.JSONDecoder()
+    eof = False
+    while True:
+        while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] == ","):
+            pos += 1
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+        if pos < len(buffer):
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield item
+                continue
+        elif eof:
+            raise json.JSONDecodeError("Массив не закрыт", buffer, pos)
+
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def _iter_json_lines(f: IO[str], buffer: str, chunk_size: int) -> Iterator[Any]:
+    """Декодирует файл в формате JSON Lines, пропуская некорректные строки"""
+    line_number = 0
+    while True:
+        chunk = f.read(chunk_size)
+        buffer += chunk
+        lines = buffer.split("\n")
+        buffer = lines.pop() if chunk else ""
+        for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Некорректная JSON-строка {line_number} пропущена")
+        if not chunk:
+            return
+
+
+def iter_transactions(file_path: str, chunk_size: int = 65536, strict: bool = False) -> Iterator[Dict[str, Any]]:
+    """Потоково читает транзакции из JSON-массива или JSON Lines, отдавая их по одной.
+
+    Файл читается блоками по chunk_size символов, поэтому расход памяти не зависит от размера файла,
+    а прекращение перебора сразу закрывает файл. Элементы, не являющиеся объектами, пропускаются.
+    При strict=True отсутствие файла и ошибки чтения передаются вызывающему коду, а не только в лог.
+    """
+    path = Path(file_path)
+    if not path.is_file():
+        if strict:
+            raise FileNotFoundError(f"Файл {file_path} не найден")
+        return
+
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            buffer = f.read(chunk_size)
+            while buffer and not buffer.strip():
+                buffer = f.read(chunk_size)
+            if not buffer:
+                return
+
+            start = len(buffer) - len(buffer.lstrip())
+            if buffer[start] == "[":
+                items = _iter_json_array(f, buffer, start + 1, chunk_size)
+            else:
+                items = _iter_json_lines(f, buffer, chunk_size)
+
+            for item in items:
+                if isinstance(item, dict):
+                    yield item
+                else:
+                    logger.warning(f"Элемент не является транзакцией и пропущен: {type(item).__name__}")
+
+    except json.JSONDecodeError as e:
+        logger.error(f"Некорректный JSON в файле {file_path}: {e.msg}")
+        if strict:
+            raise
+    except OSError as e:
+        logger.error(f"Ошибка чтения файла {file_path}: {e}")
+        if strict:
+            raise
+
+
+def load_transaction_records(file_path: str) -> List[Transaction]:
+    """Потоково загружает транзакции из JSON-файла в виде записей Transaction"""
+    return [Transaction.from_dict(item) for item in iter_transactions(file_path)]
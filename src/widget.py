@@ -1,6 +1,6 @@
 from typing import Optional
 
-from src.masks import get_mask_account, get_mask_card_number
+from src.masks import cached_masking, get_mask_account, get_mask_card_number
 
 
 def mask_account_card(type_and_number: Optional[str]) -> Optional[str]:
@@ -9,6 +9,12 @@ def mask_account_card(type_and_number: Optional[str]) -> Optional[str]:
         return None
     if not isinstance(type_and_number, str):
         return None
+    return _mask_account_card(type_and_number)
+
+
+@cached_masking
+def _mask_account_card(type_and_number: str) -> str:
+    """Маскирует строку вида «<тип> <номер>»; результат кэшируется, повторные строки не разбираются заново"""
     type_and_number = type_and_number.strip()
     if not type_and_number:
         return ""
@@ -1,8 +1,10 @@
+import random
 from typing import Dict, List
 
 import pytest
 
-from src.counters import count_categories
+from src.counters import CategoryMatcher, count_categories
+from src.transaction_frame import TransactionFrame
 
 
 @pytest.fixture
@@ -24,3 +26,41 @@ def test_count_categories(sample_transactions: List[Dict[str, str]]) -> None:
 def test_count_categories_empty(sample_transactions: List[Dict[str, str]]) -> None:
     result: Dict[str, int] = count_categories(sample_transactions, [])
     assert result == {}
+
+
+def test_count_categories_frame(sample_transactions: List[Dict[str, str]]) -> None:
+    frame = TransactionFrame.from_records(sample_transactions + [{"id": "no description"}])
+    result: Dict[str, int] = count_categories(frame, ["перевод", "оплата"])
+    assert result == {"перевод": 2, "оплата": 2}
+
+
+def _count_categories_naive(descriptions: List[str], categories: List[str]) -> Dict[str, int]:
+    return {category: sum(1 for desc in descriptions if category.lower() in desc.lower()) for category in categories}
+
+
+@pytest.mark.parametrize(
+    "categories",
+    [
+        ["перевод", "Перевод", "перевод", "вод", "од", "д"],
+        ["", "оплата", "плата налогов", "ата", "оплата налогов"],
+        ["aa", "a", "aaa", "ab", "bab", "b"],
+        ["İstanbul", "i̇st", "ß", "SS"],
+        ["нет такой категории"],
+    ],
+)
+def test_count_categories_matches_naive(categories: List[str]) -> None:
+    random.seed(0)
+    alphabet = "abАаоплтвдерИİßs "
+    descriptions = ["Перевод организации", "Оплата налогов", "", "istanbul İstanbul", "STRASSE straße"]
+    descriptions += ["".join(random.choices(alphabet, k=random.randint(0, 12))) for _ in range(300)]
+    transactions = [{"description": desc} for desc in descriptions]
+
+    result = count_categories(transactions, categories)
+    assert result == _count_categories_naive(descriptions, categories)
+    assert list(result) == list(dict.fromkeys(categories))
+
+
+def test_category_matcher_find() -> None:
+    matcher = CategoryMatcher(["he", "she", "his", "hers"])
+    assert matcher.find("ushers") == {0, 1, 3}
+    assert matcher.find("") == set()
@@ -1,10 +1,17 @@
+import asyncio
 import os
+import threading
+import time
+from pathlib import Path
 from tempfile import NamedTemporaryFile
+from typing import AsyncGenerator, AsyncIterator, Generator, List, Optional
 
 import pytest
 from _pytest.capture import CaptureFixture
 
-from src.decorators import log
+from src import decorators
+from src.decorators import flush_logs, log
+from src.metrics import registry
 
 
 # Вспомогательные функции с аннотациями типов
@@ -92,3 +99,202 @@ class TestLogDecorator:
         assert f"Result: {expected}" in output
         assert "END" in output
         assert result == expected
+
+    def test_buffered_file_logging(self, tmp_path: Path) -> None:
+        log_file = tmp_path / "buffered.log"
+
+        @log(filename=str(log_file), buffered=True)
+        def decorated_func(a: int, b: int) -> int:
+            return a + b
+
+        for i in range(3):
+            decorated_func(i, 1)
+        assert not log_file.exists()
+
+        flush_logs()
+        content = log_file.read_text(encoding="utf-8")
+        assert content.count("decorated_func - START") == 3
+        assert "Args: 2, 1" in content
+        assert "Result: 3" in content
+
+    def test_buffered_flushes_on_timer(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(decorators, "FLUSH_INTERVAL", 0.05)
+        log_file = tmp_path / "timer.log"
+
+        @log(filename=str(log_file), buffered=True)
+        def decorated_func() -> int:
+            return 1
+
+        decorated_func()
+        deadline = time.monotonic() + 5
+        while not log_file.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert "decorated_func - START" in log_file.read_text(encoding="utf-8")
+
+    def test_buffered_write_does_not_block_callers(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        writing, release = threading.Event(), threading.Event()
+        written: List[str] = []
+
+        def slow_write(filename: Optional[str], message: str) -> None:
+            writing.set()
+            release.wait(5)
+            written.append(message)
+
+        monkeypatch.setattr(decorators, "_write", slow_write)
+        writer = decorators._BufferedWriter()
+        writer.write("a.log", "первое\n")
+        flusher = threading.Thread(target=writer.flush)
+        flusher.start()
+        assert writing.wait(5)
+
+        writer.write("a.log", "второе\n")
+        assert written == []
+        release.set()
+        flusher.join(5)
+        writer.flush()
+
+        assert written == ["первое\n", "второе\n"]
+
+    def test_sampling_logs_errors_only(self, capsys: CaptureFixture) -> None:
+        @log(sample_rate=0.0)
+        def decorated_func(a: int, b: int) -> int:
+            if b == 0:
+                raise ZeroDivisionError("division by zero")
+            return a // b
+
+        assert decorated_func(4, 2) == 2
+        assert capsys.readouterr().out == ""
+
+        with pytest.raises(ZeroDivisionError):
+            decorated_func(4, 0)
+        output = capsys.readouterr().out
+        assert "Args: 4, 0" in output
+        assert "Error: ZeroDivisionError: division by zero" in output
+
+    def test_repr_is_capped(self, capsys: CaptureFixture) -> None:
+        @log()
+        def decorated_func(items: List[int]) -> str:
+            return "x" * 10_000
+
+        decorated_func(list(range(100_000)))
+        output = capsys.readouterr().out
+
+        assert "Args: [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, ...]" in output
+        assert len(output) < 1000
+
+    def test_timing(self, capsys: CaptureFixture) -> None:
+        @log(timing=True)
+        def decorated_func(a: int, b: int) -> int:
+            return a + b
+
+        registry.reset()
+        decorated_func(1, 2)
+
+        assert "Time: " in capsys.readouterr().out
+        assert registry.snapshot()[f"{__name__}.{decorated_func.__qualname__}"]["calls"] == 1
+
+    def test_generator_logging(self, capsys: CaptureFixture) -> None:
+        @log()
+        def numbers(n: int) -> Generator[int, None, None]:
+            yield from range(n)
+
+        gen = numbers(3)
+        assert capsys.readouterr().out == ""
+
+        assert list(gen) == [0, 1, 2]
+        output = capsys.readouterr().out
+        assert "numbers - START" in output
+        assert "Yielded: 3 items" in output
+        assert "generator object" not in output
+
+    def test_generator_closed_early(self, capsys: CaptureFixture) -> None:
+        @log()
+        def numbers() -> Generator[int, None, None]:
+            yield from range(100)
+
+        gen = numbers()
+        assert next(gen) == 0
+        assert next(gen) == 1
+        gen.close()
+
+        assert "Closed after 2 items" in capsys.readouterr().out
+
+    def test_generator_error(self, capsys: CaptureFixture) -> None:
+        @log()
+        def numbers() -> Generator[int, None, None]:
+            yield 1
+            raise ValueError("broken")
+
+        with pytest.raises(ValueError):
+            list(numbers())
+
+        assert "Yielded: 1 items, Error: ValueError: broken" in capsys.readouterr().out
+
+    def test_generator_send_and_throw(self, capsys: CaptureFixture) -> None:
+        @log()
+        def accumulator() -> Generator[int, int, str]:
+            total = 0
+            while True:
+                try:
+                    value = yield total
+                except ValueError:
+                    value = -total
+                if value is None:
+                    return f"total={total}"
+                total += value
+
+        gen = accumulator()
+        assert next(gen) == 0
+        assert gen.send(5) == 5
+        assert gen.send(2) == 7
+        assert gen.throw(ValueError("reset")) == 0
+        with pytest.raises(StopIteration) as stop:
+            next(gen)
+
+        assert stop.value.value == "total=0"
+        assert "Yielded: 4 items" in capsys.readouterr().out
+
+    def test_coroutine_timing(self, capsys: CaptureFixture) -> None:
+        @log(timing=True)
+        async def slow_add(a: int, b: int) -> int:
+            await asyncio.sleep(0.05)
+            return a + b
+
+        coroutine = slow_add(1, 2)
+        assert capsys.readouterr().out == ""
+
+        assert asyncio.run(coroutine) == 3
+        output = capsys.readouterr().out
+        assert "Result: 3" in output
+        assert float(output.split("Time: ")[1].split("s")[0]) >= 0.05
+
+    def test_async_generator_logging(self, capsys: CaptureFixture) -> None:
+        @log()
+        async def numbers(n: int) -> AsyncIterator[int]:
+            for i in range(n):
+                await asyncio.sleep(0)
+                yield i
+
+        async def consume() -> List[int]:
+            return [i async for i in numbers(4)]
+
+        assert asyncio.run(consume()) == [0, 1, 2, 3]
+        assert "Yielded: 4 items" in capsys.readouterr().out
+
+    def test_async_generator_asend(self, capsys: CaptureFixture) -> None:
+        @log()
+        async def accumulator() -> AsyncGenerator[int, int]:
+            total = 0
+            while total < 10:
+                total += yield total
+
+        async def consume() -> List[int]:
+            agen = accumulator()
+            results = [await agen.__anext__(), await agen.asend(4), await agen.asend(5)]
+            with pytest.raises(StopAsyncIteration):
+                await agen.asend(1)
+            return results
+
+        assert asyncio.run(consume()) == [0, 4, 9]
+        assert "Yielded: 3 items" in capsys.readouterr().out
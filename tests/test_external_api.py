@@ -1,17 +1,91 @@
-from typing import Dict, Generator, List, Optional
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional, Set
 from unittest.mock import Mock, patch
 
 import pytest
+import requests
+
+from src.external_api import (
+    CircuitBreaker,
+    RateCache,
+    RatesClient,
+    RatesUnavailableError,
+    convert_many,
+    convert_many_async,
+    convert_to_rub,
+    convert_to_rub_async,
+    get_rate_async,
+    get_rates,
+    rates_cache,
+    rates_client,
+)
 
-from src.external_api import convert_to_rub
+
+@pytest.fixture(autouse=True)
+def clear_rates_cache(monkeypatch: pytest.MonkeyPatch) -> Generator[None, None, None]:
+    monkeypatch.setattr(rates_client, "backoff", 0)
+    rates_client.breaker.reset()
+    rates_cache.invalidate()
+    yield
+    rates_cache.invalidate()
+    rates_client.breaker.reset()
 
 
 @pytest.fixture
 def mock_exchange_api() -> Generator[Mock, None, None]:
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         yield mock_get
 
 
+class StubRatesServer(ThreadingHTTPServer):
+    """Локальный HTTP-сервер, отвечающий статусами из заданной очереди"""
+
+    def __init__(self, statuses: List[int]) -> None:
+        super().__init__(("127.0.0.1", 0), StubRatesHandler)
+        self.statuses = statuses
+        self.requests_count = 0
+        self.client_ports: Set[int] = set()
+
+
+class StubRatesHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StubRatesServer
+
+    def do_GET(self) -> None:
+        self.server.requests_count += 1
+        self.server.client_ports.add(self.client_address[1])
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        body = json.dumps({"rates": {"RUB": 90.0}}).encode() if status == 200 else b"{}"
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def stub_server() -> Generator[StubRatesServer, None, None]:
+    server = StubRatesServer([])
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(server: StubRatesServer, **kwargs: Any) -> RatesClient:
+    host, port = server.server_address[:2]
+    return RatesClient(base_url=f"http://{host!s}:{port}/latest", api_key="test", timeout=2, backoff=0, **kwargs)
+
+
 @pytest.fixture
 def sample_transactions() -> List[Dict[str, str]]:
     return [
@@ -49,3 +123,268 @@ def test_convert_to_rub_with_mock(
 def test_convert_rub_without_api(sample_transactions: List[Dict[str, str]]) -> None:
     rub_transaction = next(t for t in sample_transactions if t["currency"] == "RUB")
     assert convert_to_rub(rub_transaction) == 100.0
+
+
+def test_convert_to_rub_uses_cached_rate(mock_exchange_api: Mock) -> None:
+    mock_exchange_api.return_value.json.return_value = {"rates": {"RUB": 90.0}}
+
+    results = [convert_to_rub({"amount": "10", "currency": "USD"}) for _ in range(5)]
+
+    assert results == [900.0] * 5
+    assert mock_exchange_api.call_count == 1
+
+
+def test_convert_to_rub_failure_not_cached(mock_exchange_api: Mock) -> None:
+    mock_exchange_api.side_effect = [
+        requests.ConnectionError("network down"),
+        requests.ConnectionError("network down"),
+        requests.ConnectionError("network down"),
+        Mock(json=Mock(return_value={"rates": {"RUB": 90.0}})),
+    ]
+
+    assert convert_to_rub({"amount": "1", "currency": "USD"}) == 0.0
+    assert convert_to_rub({"amount": "1", "currency": "USD"}) == 90.0
+
+
+def test_rate_cache_ttl_expiry() -> None:
+    cache = RateCache(ttl=60)
+    cache.set("USD", 90.0)
+    assert cache.get("USD") == 90.0
+
+    with patch("src.external_api.time.time", return_value=time.time() + 61):
+        assert cache.get("USD") is None
+
+
+def test_rate_cache_invalidate() -> None:
+    cache = RateCache(ttl=60)
+    cache.set("USD", 90.0)
+    cache.set("EUR", 100.0)
+
+    cache.invalidate("usd")
+    assert cache.get("USD") is None
+    assert cache.get("EUR") == 100.0
+
+    cache.invalidate()
+    assert cache.get("EUR") is None
+
+
+def test_rate_cache_snapshot_survives_restart(tmp_path: Path) -> None:
+    snapshot = tmp_path / "rates.json"
+    RateCache(ttl=60, snapshot_path=str(snapshot)).set("USD", 90.0)
+
+    restored = RateCache(ttl=60, snapshot_path=str(snapshot))
+    assert restored.get("USD") == 90.0
+
+
+def test_rate_cache_snapshot_skips_expired(tmp_path: Path) -> None:
+    snapshot = tmp_path / "rates.json"
+    snapshot.write_text('{"USD": [90.0, 0]}', encoding="utf-8")
+
+    assert RateCache(ttl=60, snapshot_path=str(snapshot)).get("USD") is None
+
+
+def test_rate_cache_corrupted_snapshot(tmp_path: Path) -> None:
+    snapshot = tmp_path / "rates.json"
+    snapshot.write_text("not json", encoding="utf-8")
+
+    assert RateCache(ttl=60, snapshot_path=str(snapshot)).get("USD") is None
+
+
+def test_convert_many_single_request(mock_exchange_api: Mock, sample_transactions: List[Dict[str, str]]) -> None:
+    mock_exchange_api.return_value.json.return_value = {"rates": {"USD": 0.01, "EUR": 0.008}}
+
+    result = convert_many(sample_transactions * 1000)
+
+    assert mock_exchange_api.call_count == 1
+    _, kwargs = mock_exchange_api.call_args
+    assert kwargs["params"] == {"base": "RUB", "symbols": "EUR,USD"}
+    assert result[:5] == pytest.approx([100.0, 5000.0, 0.0, 0.0, 0.0])
+    assert len(result) == 5000
+
+
+def test_convert_many_uses_cache(mock_exchange_api: Mock) -> None:
+    rates_cache.set("USD", 90.0)
+    mock_exchange_api.return_value.json.return_value = {"rates": {"EUR": 0.01}}
+
+    result = convert_many([{"amount": "2", "currency": "USD"}, {"amount": "3", "currency": "eur"}])
+
+    assert result == pytest.approx([180.0, 300.0])
+    _, kwargs = mock_exchange_api.call_args
+    assert kwargs["params"]["symbols"] == "EUR"
+    assert convert_to_rub({"amount": "1", "currency": "EUR"}) == pytest.approx(100.0)
+    assert mock_exchange_api.call_count == 1
+
+
+def test_convert_many_api_failure(mock_exchange_api: Mock) -> None:
+    mock_exchange_api.side_effect = requests.ConnectionError("network down")
+
+    result = convert_many([{"amount": "10", "currency": "RUB"}, {"amount": "10", "currency": "USD"}])
+
+    assert result == [10.0, 0.0]
+
+
+def test_get_rates_skips_invalid_symbols(mock_exchange_api: Mock) -> None:
+    mock_exchange_api.return_value.json.return_value = {"rates": {"USD": 0.0}}
+
+    assert get_rates(["USD", "EUR"]) == {}
+
+
+def test_convert_many_empty(mock_exchange_api: Mock) -> None:
+    assert convert_many([]) == []
+    mock_exchange_api.assert_not_called()
+
+
+def test_rates_client_reuses_connection(stub_server: StubRatesServer) -> None:
+    client = make_client(stub_server)
+
+    for _ in range(3):
+        assert client.latest("USD", ["RUB"]) == {"RUB": 90.0}
+    client.close()
+
+    assert stub_server.requests_count == 3
+    assert len(stub_server.client_ports) == 1
+
+
+def test_rates_client_retries_server_errors(stub_server: StubRatesServer) -> None:
+    stub_server.statuses = [503, 500]
+    client = make_client(stub_server, max_retries=2)
+
+    assert client.latest("USD", ["RUB"]) == {"RUB": 90.0}
+    assert stub_server.requests_count == 3
+
+
+def test_rates_client_does_not_retry_client_errors(stub_server: StubRatesServer) -> None:
+    stub_server.statuses = [401]
+    client = make_client(stub_server, max_retries=2)
+
+    with pytest.raises(RatesUnavailableError):
+        client.latest("USD", ["RUB"])
+    assert stub_server.requests_count == 1
+
+
+def test_rates_client_circuit_breaker_fails_fast(stub_server: StubRatesServer) -> None:
+    stub_server.statuses = [500] * 4
+    client = make_client(stub_server, max_retries=1)
+    client.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+    for _ in range(2):
+        with pytest.raises(RatesUnavailableError):
+            client.latest("USD", ["RUB"])
+    assert stub_server.requests_count == 4
+
+    with pytest.raises(RatesUnavailableError, match="цепь разомкнута"):
+        client.latest("USD", ["RUB"])
+    assert stub_server.requests_count == 4
+
+
+def test_circuit_breaker_half_open_after_timeout() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    with patch("src.external_api.time.monotonic", return_value=time.monotonic() + 31):
+        assert breaker.allow()
+        assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.allow()
+    assert breaker.allow()
+
+
+def test_circuit_breaker_single_trial_across_threads() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    barrier = threading.Barrier(8)
+    results: List[bool] = []
+
+    def try_request() -> None:
+        barrier.wait()
+        results.append(breaker.allow())
+
+    with patch("src.external_api.time.monotonic", return_value=time.monotonic() + 31):
+        threads = [threading.Thread(target=try_request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert sorted(results) == [False] * 7 + [True]
+
+
+def test_circuit_breaker_failed_trial_reopens() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    trial_at = time.monotonic() + 31
+
+    with patch("src.external_api.time.monotonic", return_value=trial_at):
+        assert breaker.allow()
+        breaker.record_failure()
+    with patch("src.external_api.time.monotonic", return_value=trial_at + 10):
+        assert not breaker.allow()
+    with patch("src.external_api.time.monotonic", return_value=trial_at + 31):
+        assert breaker.allow()
+
+
+def test_convert_to_rub_when_circuit_open(mock_exchange_api: Mock) -> None:
+    for _ in range(rates_client.breaker.failure_threshold):
+        rates_client.breaker.record_failure()
+
+    assert convert_to_rub({"amount": "10", "currency": "USD"}) == 0.0
+    mock_exchange_api.assert_not_called()
+
+
+def test_convert_to_rub_async_deduplicates_inflight(mock_exchange_api: Mock) -> None:
+    def slow_get(*args: object, **kwargs: object) -> Mock:
+        time.sleep(0.05)
+        return Mock(json=Mock(return_value={"rates": {"RUB": 90.0}}))
+
+    mock_exchange_api.side_effect = slow_get
+
+    async def run() -> List[float]:
+        return await asyncio.gather(*(convert_to_rub_async({"amount": "1", "currency": "USD"}) for _ in range(10)))
+
+    assert asyncio.run(run()) == [90.0] * 10
+    assert mock_exchange_api.call_count == 1
+
+
+def test_get_rate_async_respects_semaphore(mock_exchange_api: Mock) -> None:
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_get(*args: object, **kwargs: object) -> Mock:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return Mock(json=Mock(return_value={"rates": {"RUB": 1.0}}))
+
+    mock_exchange_api.side_effect = slow_get
+
+    async def run() -> List[Optional[float]]:
+        semaphore = asyncio.Semaphore(2)
+        return await asyncio.gather(*(get_rate_async(code, semaphore) for code in ("USD", "EUR", "GBP", "CNY", "JPY")))
+
+    assert asyncio.run(run()) == [1.0] * 5
+    assert mock_exchange_api.call_count == 5
+    assert peak <= 2
+
+
+def test_convert_many_async(mock_exchange_api: Mock, sample_transactions: List[Dict[str, str]]) -> None:
+    mock_exchange_api.return_value.json.return_value = {"rates": {"RUB": 90.0}}
+
+    result = asyncio.run(convert_many_async(sample_transactions * 100, concurrency=1))
+
+    assert result[:5] == [100.0, 4500.0, 0.0, 0.0, 0.0]
+    assert len(result) == 500
+    assert mock_exchange_api.call_count == 2
+
+
+def test_convert_to_rub_async_failure(mock_exchange_api: Mock) -> None:
+    mock_exchange_api.side_effect = requests.ConnectionError("network down")
+
+    assert asyncio.run(convert_to_rub_async({"amount": "5", "currency": "EUR"})) == 0.0
+    assert asyncio.run(convert_to_rub_async({"amount": "5", "currency": "RUB"})) == 5.0
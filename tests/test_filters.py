@@ -1,8 +1,17 @@
+import re
 from typing import Dict, List
 
 import pytest
 
-from src.filters import filter_by_description
+from src.filters import (
+    SearchMode,
+    clear_pattern_cache,
+    description_matcher,
+    filter_by_description,
+    pattern_cache_info,
+)
+from src.models import Transaction
+from src.transaction_frame import TransactionFrame
 
 
 @pytest.fixture
@@ -30,3 +39,70 @@ def test_filter_by_description_regex(sample_transactions: List[Dict[str, str]])
     result: List[Dict[str, str]] = filter_by_description(sample_transactions, r"перевод\s+организации")
     assert len(result) == 1
     assert result[0]["description"] == "Перевод организации"
+
+
+def test_filter_by_description_frame(sample_transactions: List[Dict[str, str]]) -> None:
+    frame = TransactionFrame.from_records(sample_transactions + [{"amount": "500"}])
+
+    result = filter_by_description(frame, "перевод")
+    assert isinstance(result, TransactionFrame)
+    assert result.descriptions.tolist() == ["Перевод организации", "Перевод с карты на карту"]
+    assert len(filter_by_description(frame, "[")) == 0
+
+
+def test_filter_by_description_records(sample_transactions: List[Dict[str, str]]) -> None:
+    records = [Transaction.from_dict(t) for t in sample_transactions] + [Transaction.from_dict({})]
+
+    result = filter_by_description(records, ".*организации")
+    assert [t.description for t in result] == ["Перевод организации"]
+
+
+@pytest.mark.parametrize(
+    "terms, mode, expected",
+    [
+        (["вклад", "услуг"], "any", ["Оплата услуг", "Открытие вклада"]),
+        (["перевод", "КАРТ"], "all", ["Перевод с карты на карту"]),
+        (["перевод", r"орган\w+"], "all", ["Перевод организации"]),
+        ([r"^оплата", r"вклада$"], "any", ["Оплата услуг", "Открытие вклада"]),
+        (["перевод", "["], "any", []),
+        ([], "any", []),
+    ],
+)
+def test_filter_by_description_multiple_terms(
+    sample_transactions: List[Dict[str, str]], terms: List[str], mode: SearchMode, expected: List[str]
+) -> None:
+    result = filter_by_description(sample_transactions, terms, mode)
+    assert [t["description"] for t in result] == expected
+
+
+def test_filter_by_description_inline_flags() -> None:
+    transactions = [{"description": "Перевод ABC"}, {"description": "Оплата услуг"}]
+
+    assert filter_by_description(transactions, "(?i)abc") == [transactions[0]]
+    assert filter_by_description(transactions, ["(?i)abc", "услуг"]) == transactions
+    assert filter_by_description(transactions, ["(?i)abc", "перевод"], "all") == [transactions[0]]
+    assert filter_by_description(transactions, ["(?i)abc", "["]) == []
+
+
+@pytest.mark.parametrize("search", ["перевод с", "ПЕРЕВОД", "", "Ё-моё, 100%"])
+def test_literal_fast_path_matches_regex(search: str) -> None:
+    descriptions = ["Перевод с карты", "перевод", "Ё-моё, 100% кэшбэк", "Оплата"]
+    matcher = description_matcher(search)
+
+    assert [matcher(d) for d in descriptions] == [
+        re.search(search, d, re.IGNORECASE) is not None for d in descriptions
+    ]
+
+
+def test_pattern_cache(sample_transactions: List[Dict[str, str]]) -> None:
+    clear_pattern_cache()
+    for _ in range(3):
+        filter_by_description(sample_transactions, r"перевод\s+\w+")
+
+    assert pattern_cache_info()["hits"] == 2
+    assert pattern_cache_info()["misses"] == 1
+
+
+def test_filter_by_description_unknown_mode(sample_transactions: List[Dict[str, str]]) -> None:
+    with pytest.raises(ValueError):
+        filter_by_description(sample_transactions, ["перевод"], "none")  # type: ignore[call-overload]
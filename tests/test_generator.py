@@ -7,6 +7,7 @@ from src.generator import (
     filter_by_currency,
     transaction_descriptions,
 )
+from src.transaction_frame import TransactionFrame
 
 
 # Фикстуры для тестов
@@ -59,6 +60,14 @@ def test_filter_by_currency_missing_key(sample_transactions: List[Dict[str, Any]
     assert len(result) == 2
 
 
+def test_filter_by_currency_frame(sample_transactions: List[Dict[str, Any]]) -> None:
+    """Тестирует фильтрацию колоночной таблицы по валюте"""
+    frame = TransactionFrame.from_records(sample_transactions)
+    result = list(filter_by_currency(frame, "USD"))
+    assert [t["description"] for t in result] == ["Payment 1", "Payment 3"]
+    assert list(transaction_descriptions(frame)) == ["Payment 1", "Payment 2", "Payment 3"]
+
+
 # Параметризованные тесты для transaction_descriptions
 @pytest.mark.parametrize(
     "transactions, expected_descriptions",
@@ -0,0 +1,70 @@
+import logging
+from logging.handlers import QueueHandler
+from pathlib import Path
+
+import pytest
+
+from src import logger_config
+from src.logger_config import RateLimitFilter, SamplingFilter, get_logger, shutdown_logging
+
+
+@pytest.fixture(autouse=True)
+def log_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(logger_config, "LOG_DIR", tmp_path)
+    return tmp_path
+
+
+def test_get_logger_is_idempotent(log_dir: Path) -> None:
+    logger = get_logger("idempotent")
+    logger.setLevel(logging.INFO)
+    logger.info("первая запись")
+    assert get_logger("idempotent") is logger
+    logger.info("вторая запись")
+    shutdown_logging()
+
+    assert sum(isinstance(handler, QueueHandler) for handler in logger.handlers) == 1
+    content = (log_dir / "idempotent.log").read_text(encoding="utf-8")
+    assert "idempotent - INFO - первая запись" in content
+    assert "вторая запись" in content
+
+
+def test_child_logger_is_routed_to_parent_file(log_dir: Path) -> None:
+    get_logger("routed").setLevel(logging.INFO)
+    logging.getLogger("routed.child").info("из дочернего логгера")
+    shutdown_logging()
+
+    assert "routed.child - INFO - из дочернего логгера" in (log_dir / "routed.log").read_text(encoding="utf-8")
+
+
+def test_rate_limit_keeps_warnings(log_dir: Path) -> None:
+    logger = get_logger("limited", rate_limit=0.001)
+    logger.setLevel(logging.INFO)
+    for i in range(100):
+        logger.info("запись %d", i)
+    logger.warning("предупреждение")
+    shutdown_logging()
+
+    lines = (log_dir / "limited.log").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert "предупреждение" in lines[-1]
+    rate_filter = next(f for f in logger.filters if isinstance(f, RateLimitFilter))
+    assert rate_filter.dropped == 99
+
+
+def test_filters_replaced_only_when_passed() -> None:
+    logger = get_logger("sampled", sample_rate=0.0)
+    logger.setLevel(logging.INFO)
+    logger.info("отброшено")
+    assert next(f for f in logger.filters if isinstance(f, SamplingFilter)).dropped == 1
+
+    get_logger("sampled")
+    assert len(logger.filters) == 1
+
+    get_logger("sampled", sample_rate=1.0, rate_limit=10)
+    sampling = [f for f in logger.filters if isinstance(f, SamplingFilter)]
+    assert len(sampling) == 1 and sampling[0].sample_rate == 1.0
+    assert sum(isinstance(f, RateLimitFilter) for f in logger.filters) == 1
+
+    get_logger("sampled", sample_rate=0.5)
+    assert sum(isinstance(f, RateLimitFilter) for f in logger.filters) == 1
+    assert [f.sample_rate for f in logger.filters if isinstance(f, SamplingFilter)] == [0.5]
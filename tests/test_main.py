@@ -1,6 +1,7 @@
 import json
 import os
 import sys
+import time
 from pathlib import Path
 from typing import Dict, List
 from unittest.mock import patch
@@ -8,17 +9,28 @@ from unittest.mock import patch
 import pandas as pd
 import pytest
 
+from src import parsed_cache
 from src.main import (
+    iter_transactions_from_csv,
     load_transactions_from_csv,
     load_transactions_from_json,
     load_transactions_from_xlsx,
     main,
     print_transactions,
+    run_batch,
 )
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Направляет кэш разобранных XLSX во временный каталог."""
+    directory = tmp_path / "cache"
+    monkeypatch.setattr(parsed_cache, "CACHE_DIR", str(directory))
+    return directory
+
+
 @pytest.fixture
 def mock_transactions_data() -> List[Dict]:
     """Фикстура, предоставляющая тестовые данные транзакций."""
@@ -218,6 +230,43 @@ def test_load_transactions_from_csv_success(tmp_path: Path) -> None:
     assert transactions[1]["operationAmount"]["currency"]["code"] == "USD"
 
 
+def test_load_transactions_from_csv_semicolon_flat_columns(tmp_path: Path) -> None:
+    test_csv_content = (
+        "id;state;date;amount;currency_name;currency_code;from;to;description\n"
+        "650703;EXECUTED;2023-09-05T11:30:32Z;16210;Sol;PEN;Счет 58803664561298323391;Счет 39745660563456619397;"
+        "Перевод организации\n"
+        "3598919;EXECUTED;2020-12-06T23:00:58Z;29740;Peso;COP;;Discover 0720428384694643;Перевод с карты на карту\n"
+    )
+    test_filepath = tmp_path / "test.csv"
+    test_filepath.write_text(test_csv_content, encoding="utf-8")
+
+    transactions = load_transactions_from_csv(str(test_filepath))
+
+    assert len(transactions) == 2
+    assert transactions[0]["description"] == "Перевод организации"
+    assert transactions[0]["operationAmount"] == {"amount": "16210", "currency": {"name": "Sol", "code": "PEN"}}
+    assert "amount" not in transactions[0]
+    assert transactions[1]["from"] == ""
+
+
+def test_iter_transactions_from_csv_is_lazy(tmp_path: Path) -> None:
+    rows = "".join(f"{i},EXECUTED,Операция {i}\n" for i in range(1000))
+    test_filepath = tmp_path / "big.csv"
+    test_filepath.write_text("id,state,description\n" + rows, encoding="utf-8")
+
+    transactions = iter_transactions_from_csv(str(test_filepath))
+
+    assert next(transactions) == {"id": "0", "state": "EXECUTED", "description": "Операция 0"}
+    assert next(transactions)["id"] == "1"
+    transactions.close()
+
+
+def test_load_transactions_from_csv_file_not_found(capsys: pytest.CaptureFixture, tmp_path: Path) -> None:
+    non_existent_path = tmp_path / "non_existent.csv"
+    assert load_transactions_from_csv(str(non_existent_path)) == []
+    assert f"Ошибка: Файл {non_existent_path} не найден." in capsys.readouterr().out
+
+
 def test_load_transactions_from_xlsx_success() -> None:
     """Для мокирования pandas.read_excel, нужно создать mock DataFrame"""
     mock_df = pd.DataFrame([{"id": 1, "state": "EXECUTED", "description": "XLSX Test"}])
@@ -262,3 +311,130 @@ def test_print_transactions_with_data(capsys: pytest.CaptureFixture) -> None:
         assert "Всего банковских операций в выборке: 2" in output
         assert "2023-01-01 Покупка Счет **** **** 1234 Сумма: 100.00 руб." in output
         assert "2023-01-02 Перевод Visa **** **** 7890 -> Mast **** **** 3210 Сумма: 50.00 USD" in output
+
+
+@pytest.fixture
+def transactions_json_file(tmp_path: Path, mock_transactions_data: List[Dict]) -> Path:
+    file_path = tmp_path / "operations.json"
+    file_path.write_text(json.dumps(mock_transactions_data, ensure_ascii=False), encoding="utf-8")
+    return file_path
+
+
+def test_run_batch_to_stdout(capsys: pytest.CaptureFixture, transactions_json_file: Path) -> None:
+    """Тест: пакетный режим с выводом в stdout."""
+    exit_code = run_batch(["--input", str(transactions_json_file), "--state", "executed", "--sort", "asc"])
+
+    captured = capsys.readouterr()
+    rows = [json.loads(line) for line in captured.out.splitlines()]
+    assert exit_code == 0
+    assert [row["id"] for row in rows] == [2, 1]
+    assert rows[1]["operationAmount"] == {"amount": "40542.00", "currency": {"name": "руб.", "code": "RUB"}}
+    assert "Чтение и фильтрация: 4 строк, отобрано 2" in captured.err
+    assert "Сортировка: 2 строк" in captured.err
+    assert "Запись: 2 строк" in captured.err
+
+
+def test_run_batch_to_file(capsys: pytest.CaptureFixture, tmp_path: Path, transactions_json_file: Path) -> None:
+    """Тест: пакетный режим с записью результата в файл."""
+    output = tmp_path / "out.jsonl"
+    exit_code = run_batch(
+        [
+            "--input",
+            str(transactions_json_file),
+            "--currency",
+            "RUB",
+            "--search",
+            "перевод",
+            "--output",
+            str(output),
+        ]
+    )
+
+    rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert exit_code == 0
+    assert [row["id"] for row in rows] == [3]
+    assert capsys.readouterr().out == ""
+
+
+def test_run_batch_csv_input(capsys: pytest.CaptureFixture, tmp_path: Path) -> None:
+    """Тест: пакетный режим читает CSV с разделителем ";"."""
+    file_path = tmp_path / "operations.csv"
+    file_path.write_text(
+        "id;state;date;amount;currency_name;currency_code;description\n"
+        "1;EXECUTED;2023-09-05T11:30:32Z;16210;Ruble;RUB;Перевод организации\n"
+        "2;CANCELED;2023-09-06T11:30:32Z;100;Ruble;RUB;Перевод организации\n",
+        encoding="utf-8",
+    )
+
+    assert run_batch(["--input", str(file_path), "--state", "EXECUTED"]) == 0
+    assert [json.loads(line)["id"] for line in capsys.readouterr().out.splitlines()] == ["1"]
+
+
+@pytest.mark.parametrize("file_name, create", [("missing.json", False), ("operations.txt", True)])
+def test_run_batch_bad_input(capsys: pytest.CaptureFixture, tmp_path: Path, file_name: str, create: bool) -> None:
+    """Тест: пакетный режим с отсутствующим или неподдерживаемым файлом."""
+    file_path = tmp_path / file_name
+    if create:
+        file_path.write_text("text", encoding="utf-8")
+
+    assert run_batch(["--input", str(file_path)]) == 1
+    assert "Ошибка" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "file_name, content",
+    [("operations.csv", b"id,description\n1,\xff\xfe\n"), ("operations.json", b'[{"id": 1}, {"id": ')],
+)
+def test_run_batch_unreadable_input(
+    capsys: pytest.CaptureFixture, tmp_path: Path, file_name: str, content: bytes
+) -> None:
+    """Тест: ошибка чтения в пакетном режиме пишется в stderr, а stdout остаётся чистым."""
+    file_path = tmp_path / file_name
+    file_path.write_bytes(content)
+
+    assert run_batch(["--input", str(file_path)]) == 1
+    captured = capsys.readouterr()
+    assert "Ошибка" in captured.err
+    assert "Ошибка" not in captured.out
+
+
+def test_run_batch_reports_xlsx_load_separately(capsys: pytest.CaptureFixture, tmp_path: Path) -> None:
+    """Тест: разбор XLSX учитывается отдельным этапом, а не во времени записи."""
+    file_path = tmp_path / "operations.xlsx"
+    file_path.write_bytes(b"")
+
+    def slow_read(filepath: str) -> pd.DataFrame:
+        time.sleep(0.2)
+        return pd.DataFrame({"id": [1], "state": ["EXECUTED"], "description": ["Перевод"]})
+
+    with patch("src.main.read_excel_cached", side_effect=slow_read):
+        assert run_batch(["--input", str(file_path)]) == 0
+
+    err = capsys.readouterr().err
+    assert float(err.split("Загрузка файла: ")[1].split(" с")[0]) >= 0.2
+    assert float(err.split("Запись: 1 строк (")[1].split(" с")[0]) < 0.2
+
+
+def test_print_transactions_keeps_source_amount_and_date(capsys: pytest.CaptureFixture) -> None:
+    """Тест: сумма и дата выводятся в том виде, в каком записаны в исходных данных."""
+    print_transactions(
+        [
+            {
+                "date": "2023-09-05T11:30:32Z",
+                "amount": 16210.0,
+                "currency_name": "Sol",
+                "currency_code": "PEN",
+                "from": float("nan"),
+                "to": "Счет 58803664561298323391",
+                "description": "Открытие вклада",
+            },
+            {"date": "05.09.2023", "operationAmount": {"amount": "100", "currency": {"name": "руб.", "code": "RUB"}}},
+            {"amount": 12.5, "description": "Покупка"},
+        ]
+    )
+
+    output = capsys.readouterr().out
+    assert "2023-09-05 Открытие вклада Счет **** **** 3391 Сумма: 16210 Sol" in output
+    assert "05.09.2023 Нет описания Сумма: 100 руб." in output
+    assert " Покупка Сумма: 12.5 " in output
+    assert "nan" not in output
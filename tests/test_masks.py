@@ -1,9 +1,12 @@
+import logging
 import random
 from typing import List
 
+import numpy as np
+import pandas as pd
 import pytest
 
-from src.masks import get_mask_account, get_mask_card_number
+from src.masks import get_mask_account, get_mask_card_number, mask_column, mask_credit_card, mask_many
 
 
 @pytest.fixture
@@ -79,3 +82,51 @@ def test_get_mask_account(account_data: List[str]) -> None:
                 assert len(masked.replace(" ", "")) == len(cleaned)
                 assert masked.replace(" ", "")[-4:] == cleaned[-4:]
                 assert all(c == "*" for c in masked.replace(" ", "")[:-4])
+
+
+def test_mask_many_matches_single_call() -> None:
+    """Тестирует пакетную маскировку: тот же результат, что и поштучно, пустые значения не изменяются"""
+    visa, account = "Visa 1234 5678 9012 3456", "Счет 73654108430135874305"
+    cards = [visa, "12345", "", None, account]
+
+    assert mask_many(cards) == [mask_credit_card(visa), "12345", "", None, mask_credit_card(account)]
+
+
+def test_mask_many_logs_one_record_without_numbers(caplog: pytest.LogCaptureFixture) -> None:
+    """Тестирует, что пакетная маскировка пишет одну запись в лог и не раскрывает номера"""
+    cards = ["7000792289606361", "7158300734726758", "123"]
+    with caplog.at_level(logging.INFO, logger="masks"):
+        mask_many(cards)
+
+    assert len(caplog.records) == 1
+    assert "всего 3, слишком коротких 1" in caplog.text
+    assert not any(card in caplog.text for card in cards)
+
+
+def test_mask_column() -> None:
+    """Тестирует векторную маскировку столбца"""
+    column = pd.Series(["Visa 1234 5678 9012 3456", "12345", None, "Maestro 1596837868705199"])
+
+    masked = mask_column(column)
+
+    assert masked[[0, 1, 3]].tolist() == [mask_credit_card(column[0]), "12345", mask_credit_card(column[3])]
+    assert pd.isna(masked[2])
+    assert mask_column(pd.Series([], dtype=object)).empty
+
+
+@pytest.mark.parametrize(
+    "column",
+    [
+        pd.Series([np.nan, np.nan]),
+        pd.Series([1234567890123456, 42]),
+        pd.Series([1234567890123456, 42], dtype=object),
+        pd.Series([True, False]),
+    ],
+)
+def test_mask_column_non_string_dtype(column: pd.Series, caplog: pytest.LogCaptureFixture) -> None:
+    """Столбец без строк возвращается без изменений, в лог пишется одна сводная запись"""
+    with caplog.at_level(logging.INFO, logger="masks"):
+        masked = mask_column(column)
+
+    pd.testing.assert_series_equal(masked, column)
+    assert [record.getMessage() for record in caplog.records] == ["Пакетная маскировка карт: всего 2, замаскировано 0"]
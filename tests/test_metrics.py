@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from src.metrics import Histogram, MetricsRegistry, registry, timed
+from src.processing import filter_by_state
+
+
+@pytest.fixture
+def metrics() -> MetricsRegistry:
+    return MetricsRegistry()
+
+
+def test_histogram_quantiles() -> None:
+    histogram = Histogram()
+    for i in range(1, 1001):
+        histogram.observe(i / 1000)
+
+    assert histogram.count == 1000
+    assert histogram.quantile(0.5) == pytest.approx(0.5, rel=0.1)
+    assert histogram.quantile(0.99) == pytest.approx(0.99, rel=0.1)
+    assert histogram.quantile(1.0) == 1.0
+    assert Histogram().quantile(0.5) == 0.0
+
+
+def test_timed_counts_calls_and_errors(metrics: MetricsRegistry) -> None:
+    @timed("divide", metrics)
+    def divide(a: int, b: int) -> float:
+        return a / b
+
+    assert divide(4, 2) == 2
+    with pytest.raises(ZeroDivisionError):
+        divide(1, 0)
+
+    snapshot = metrics.snapshot()["divide"]
+    assert snapshot["calls"] == 2
+    assert snapshot["errors"] == 1
+    assert 0 <= snapshot["p50"] <= snapshot["p95"] <= snapshot["p99"] <= snapshot["max_seconds"]
+    assert json.loads(metrics.to_json())["divide"]["calls"] == 2
+
+
+def test_to_prometheus(metrics: MetricsRegistry) -> None:
+    metrics.observe('src.module."quoted"', 0.002)
+    metrics.observe('src.module."quoted"', 0.5, error=True)
+
+    text = metrics.to_prometheus()
+    label = 'function="src.module.\\"quoted\\""'
+    assert "# TYPE function_duration_seconds histogram" in text
+    assert f"function_calls_total{{{label}}} 2" in text
+    assert f"function_errors_total{{{label}}} 1" in text
+    assert f'function_duration_seconds_bucket{{{label},le="0.001"}} 0' in text
+    assert f'function_duration_seconds_bucket{{{label},le="0.562341"}} 2' in text
+    assert f'function_duration_seconds_bucket{{{label},le="+Inf"}} 2' in text
+    assert f"function_duration_seconds_count{{{label}}} 2" in text
+
+
+def test_instrumented_functions_use_default_registry() -> None:
+    registry.reset()
+    filter_by_state([{"state": "EXECUTED"}])
+
+    assert registry.snapshot()["src.processing.filter_by_state"]["calls"] == 1
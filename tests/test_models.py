@@ -0,0 +1,92 @@
+import dataclasses
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+
+import pandas as pd
+import pytest
+
+from src.models import FinancialOperation, Transaction
+
+
+@pytest.fixture
+def canonical_transaction() -> Dict[str, Any]:
+    return {
+        "id": 441945886,
+        "state": "EXECUTED",
+        "date": "2019-08-26T10:50:58.294041",
+        "operationAmount": {"amount": "31957.58", "currency": {"name": "руб.", "code": "RUB"}},
+        "description": "Перевод организации",
+        "from": "Maestro 1596837868705199",
+        "to": "Счет 64686473678894779589",
+    }
+
+
+def test_from_dict_canonical(canonical_transaction: Dict[str, Any]) -> None:
+    record = Transaction.from_dict(canonical_transaction)
+
+    assert record.id == 441945886
+    assert record.date == datetime(2019, 8, 26, 10, 50, 58, 294041)
+    assert record.amount == 31957.58
+    assert record.state == "EXECUTED"
+    assert record.currency_code == "RUB"
+    assert record.currency_name == "руб."
+    assert record.from_account == "Maestro 1596837868705199"
+    assert record.to_account == "Счет 64686473678894779589"
+    assert record.to_dict() == canonical_transaction
+
+
+@pytest.mark.parametrize(
+    "data, amount, currency_code, date",
+    [
+        ({"amount": "16210", "currency_code": "pen", "date": "2023-09-05"}, 16210.0, "PEN", datetime(2023, 9, 5)),
+        ({"amount": 100, "currency": "USD"}, 100.0, "USD", None),
+        ({"amount": 50.0, "date": datetime(2023, 1, 1), "category": "Еда"}, 50.0, "", datetime(2023, 1, 1)),
+        ({"amount": "abc", "date": "не дата"}, None, "", None),
+        ({}, None, "", None),
+        ({"amount": math.nan, "currency_code": math.nan, "date": pd.NaT}, None, "", None),
+    ],
+)
+def test_from_dict_other_formats(data: Dict[str, Any], amount: float, currency_code: str, date: datetime) -> None:
+    record = Transaction.from_dict(data)
+
+    assert record.amount == amount
+    assert record.currency_code == currency_code
+    assert record.date == date
+
+
+def test_transaction_is_immutable_and_slotted(canonical_transaction: Dict[str, Any]) -> None:
+    record = Transaction.from_dict(canonical_transaction)
+
+    assert isinstance(record, FinancialOperation)
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        record.state = "CANCELED"  # type: ignore[misc]
+
+
+def test_from_dict_missing_values() -> None:
+    record = Transaction.from_dict(
+        {"id": 3235160.0, "from": math.nan, "to": "Счет 5683", "description": None, "state": pd.NA}
+    )
+
+    assert record.id == 3235160
+    assert isinstance(record.id, int)
+    assert record.from_account == ""
+    assert record.to_account == "Счет 5683"
+    assert record.description == ""
+    assert record.state == ""
+    assert "from" not in record.to_dict()
+
+
+def test_from_dict_xlsx_rows() -> None:
+    frame = pd.read_excel(Path(__file__).parent.parent / "data" / "transactions_excel.xlsx")
+    rows = [{str(key): value for key, value in row.items()} for row in frame.to_dict("records")]
+    records = [Transaction.from_dict(row) for row in rows]
+
+    assert any(isinstance(row["from"], float) for row in rows)
+    for record in records:
+        assert record.id is None or isinstance(record.id, int)
+        assert "nan" not in (record.from_account, record.to_account, record.description, record.state)
+        assert record.amount is None or not math.isnan(record.amount)
+    assert sum(not record.from_account for record in records) == sum(pd.isna(row["from"]) for row in rows)
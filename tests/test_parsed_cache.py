@@ -0,0 +1,143 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import parsed_cache
+from src.parsed_cache import load_frame, read_excel_cached, save_frame
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    directory = tmp_path / "cache"
+    monkeypatch.setattr(parsed_cache, "CACHE_DIR", str(directory))
+    return directory
+
+
+@pytest.fixture
+def sample_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "amount": [10.5, np.nan, -3.0],
+            "flag": [True, False, True],
+            "date": pd.Series(["2023-01-01T00:00:00", "2023-01-02T10:30:00", None], dtype="datetime64[ns]"),
+            "date_tz": pd.to_datetime(["2023-01-01T00:00:00Z", "2023-06-01T12:00:00Z", "2024-01-01T00:00:00Z"]),
+            "description": ["Перевод организации", None, "Открытие вклада 🎉"],
+        }
+    )
+
+
+@pytest.fixture
+def sample_xlsx(tmp_path: Path) -> Path:
+    file_path = tmp_path / "operations.xlsx"
+    pd.DataFrame(
+        {"date": ["2023-02-01", "2023-02-02"], "description": ["Аренда", "Связь"], "amount": [800.0, 100.0]}
+    ).to_excel(file_path, index=False)
+    return file_path
+
+
+def test_save_and_load_round_trip(tmp_path: Path, sample_frame: pd.DataFrame) -> None:
+    cache_path = tmp_path / "frame.txc"
+    save_frame(cache_path, sample_frame, {"size": 1, "mtime_ns": 2})
+
+    loaded = load_frame(cache_path, {"size": 1, "mtime_ns": 2})
+
+    assert loaded is not None
+    pd.testing.assert_frame_equal(loaded, sample_frame, check_index_type=False)
+
+
+def test_load_frame_rejects_stale_fingerprint(tmp_path: Path, sample_frame: pd.DataFrame) -> None:
+    cache_path = tmp_path / "frame.txc"
+    save_frame(cache_path, sample_frame, {"size": 1, "mtime_ns": 2})
+
+    assert load_frame(cache_path, {"size": 1, "mtime_ns": 3}) is None
+    assert load_frame(tmp_path / "missing.txc", {"size": 1, "mtime_ns": 2}) is None
+
+
+def test_read_excel_cached_hits_cache(sample_xlsx: Path, cache_dir: Path) -> None:
+    first = read_excel_cached(str(sample_xlsx))
+    assert len(list(cache_dir.glob("*.txc"))) == 1
+
+    with patch("pandas.read_excel") as mock_read_excel:
+        second = read_excel_cached(str(sample_xlsx))
+        mock_read_excel.assert_not_called()
+
+    pd.testing.assert_frame_equal(first, second, check_index_type=False)
+
+
+def test_read_excel_cached_hit_is_writable(sample_xlsx: Path, cache_dir: Path) -> None:
+    read_excel_cached(str(sample_xlsx))
+    cached = read_excel_cached(str(sample_xlsx))
+
+    cached.loc[0, "amount"] = 5.0
+    cached.loc[1, "description"] = "Изменено"
+
+    assert cached["amount"].tolist() == [5.0, 100.0]
+    assert read_excel_cached(str(sample_xlsx))["amount"].tolist() == [800.0, 100.0]
+
+
+def test_read_excel_cached_invalidated_on_change(sample_xlsx: Path, cache_dir: Path) -> None:
+    read_excel_cached(str(sample_xlsx))
+    pd.DataFrame({"date": ["2024-01-01"], "description": ["Новая"], "amount": [1.0]}).to_excel(
+        sample_xlsx, index=False
+    )
+    stat = sample_xlsx.stat()
+    os.utime(sample_xlsx, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert read_excel_cached(str(sample_xlsx))["description"].tolist() == ["Новая"]
+    assert len(list(cache_dir.glob("*.txc"))) == 1
+
+
+def test_read_excel_cached_options_are_part_of_key(sample_xlsx: Path, cache_dir: Path) -> None:
+    read_excel_cached(str(sample_xlsx))
+    parsed = read_excel_cached(str(sample_xlsx), parse_dates=["date"])
+
+    assert pd.api.types.is_datetime64_any_dtype(parsed["date"])
+    assert len(list(cache_dir.glob("*.txc"))) == 2
+
+
+def test_read_excel_cached_evicts_least_recently_used(
+    tmp_path: Path, sample_xlsx: Path, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(parsed_cache, "CACHE_MAX_ENTRIES", 2)
+    copies = []
+    for number in range(3):
+        copy = tmp_path / f"copy_{number}.xlsx"
+        copy.write_bytes(sample_xlsx.read_bytes())
+        copies.append(copy)
+
+    entries = [parsed_cache._cache_path(copy, {}) for copy in copies]
+    read_excel_cached(str(copies[0]))
+    read_excel_cached(str(copies[1]))
+    os.utime(entries[0], ns=(0, 2_000_000_000))
+    os.utime(entries[1], ns=(0, 1_000_000_000))
+    read_excel_cached(str(copies[2]))
+
+    remaining = set(cache_dir.glob("*.txc"))
+    assert remaining == {entries[0], entries[2]}
+
+
+def test_read_excel_cached_unsupported_frame_not_cached(sample_xlsx: Path, cache_dir: Path) -> None:
+    mixed = pd.DataFrame({"value": [1, "text"]}, dtype=object)
+    with patch("pandas.read_excel", return_value=mixed):
+        result = read_excel_cached(str(sample_xlsx))
+
+    assert result is mixed
+    assert list(cache_dir.glob("*.txc")) == []
+
+
+def test_read_excel_cached_corrupted_cache(sample_xlsx: Path, cache_dir: Path) -> None:
+    read_excel_cached(str(sample_xlsx))
+    cache_file = next(cache_dir.glob("*.txc"))
+    cache_file.write_bytes(b"TXCACHE1" + b"\xff" * 16)
+
+    assert read_excel_cached(str(sample_xlsx))["description"].tolist() == ["Аренда", "Связь"]
+
+
+def test_read_excel_cached_missing_file() -> None:
+    with pytest.raises(FileNotFoundError):
+        read_excel_cached("missing.xlsx")
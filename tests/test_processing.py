@@ -3,6 +3,7 @@ from typing import Any, Dict, List
 import pytest
 
 from src.processing import filter_by_state, sort_by_date
+from src.transaction_frame import TransactionFrame
 
 
 @pytest.fixture
@@ -64,3 +65,14 @@ def test_sort_by_date_errors() -> None:
 
     with pytest.raises(ValueError):
         sort_by_date([{"id": 1, "date": "invalid"}])
+
+
+def test_frame_fast_paths(sample_transactions: List[Dict[str, Any]]) -> None:
+    """Тестирует фильтрацию и сортировку колоночной таблицы"""
+    frame = TransactionFrame.from_records(sample_transactions)
+
+    filtered = filter_by_state(frame, "EXECUTED")
+    assert isinstance(filtered, TransactionFrame)
+    assert filtered.ids.tolist() == [t["id"] for t in filter_by_state(sample_transactions, "EXECUTED")]
+    assert sort_by_date(frame).ids.tolist() == [t["id"] for t in sort_by_date(sample_transactions)]
+    assert sort_by_date(frame, False).ids.tolist() == [t["id"] for t in sort_by_date(sample_transactions, False)]
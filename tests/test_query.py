@@ -0,0 +1,124 @@
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from src.models import Transaction
+from src.query import REGEX_COST, TransactionQuery
+
+
+@pytest.fixture
+def sample_transactions() -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": 1,
+            "state": "EXECUTED",
+            "date": "2019-12-08T22:45:06.000000",
+            "operationAmount": {"amount": "40542.00", "currency": {"name": "руб.", "code": "RUB"}},
+            "description": "Открытие вклада",
+        },
+        {
+            "id": 2,
+            "state": "EXECUTED",
+            "date": "2019-11-12T19:35:28.000000",
+            "operationAmount": {"amount": "130.00", "currency": {"name": "USD", "code": "USD"}},
+            "description": "Перевод с карты на карту",
+        },
+        {
+            "id": 3,
+            "state": "CANCELED",
+            "date": "2018-07-18T18:05:00.000000",
+            "operationAmount": {"amount": "8390.00", "currency": {"name": "руб.", "code": "RUB"}},
+            "description": "Перевод организации",
+        },
+        {
+            "id": 4,
+            "state": "executed",
+            "date": "2020-01-01T00:00:00.000000",
+            "operationAmount": {"amount": "10.00", "currency": {"name": "руб.", "code": "RUB"}},
+            "description": "Перевод организации",
+        },
+    ]
+
+
+def test_query_filters_and_sorts(sample_transactions: List[Dict[str, Any]]) -> None:
+    query = TransactionQuery().where_state("EXECUTED").where_currency("rub").order_by_date(reverse=True)
+
+    result = query.run(sample_transactions)
+
+    assert [t.id for t in result] == [4, 1]
+    assert query.stats.scanned == 4
+    assert query.stats.matched == 2
+
+
+def test_query_description_and_ascending_sort(sample_transactions: List[Dict[str, Any]]) -> None:
+    records = [Transaction.from_dict(t) for t in sample_transactions]
+
+    result = TransactionQuery().where_description("ПЕРЕВОД").order_by_date().run(records)
+
+    assert [t.id for t in result] == [3, 2, 4]
+
+
+def test_query_without_conditions_keeps_order(sample_transactions: List[Dict[str, Any]]) -> None:
+    assert [t.id for t in TransactionQuery().run(sample_transactions)] == [1, 2, 3, 4]
+
+
+def test_query_invalid_regex(sample_transactions: List[Dict[str, Any]]) -> None:
+    assert TransactionQuery().where_description("[").run(sample_transactions) == []
+
+
+def test_query_runs_cheap_predicates_first(sample_transactions: List[Dict[str, Any]]) -> None:
+    expensive_calls: List[Any] = []
+
+    def expensive(t: Transaction) -> bool:
+        expensive_calls.append(t.id)
+        return True
+
+    query = TransactionQuery().where(expensive, cost=REGEX_COST).where_state("CANCELED")
+
+    assert [t.id for t in query.run(sample_transactions)] == [3]
+    assert expensive_calls == [3]
+
+
+def test_query_single_pass_over_iterator(sample_transactions: List[Dict[str, Any]]) -> None:
+    consumed = 0
+
+    def stream() -> Iterator[Dict[str, Any]]:
+        nonlocal consumed
+        for t in sample_transactions:
+            consumed += 1
+            yield t
+
+    result = TransactionQuery().where_state("EXECUTED").where_description("вклад").run(stream())
+
+    assert [t.id for t in result] == [1]
+    assert consumed == 4
+
+
+def test_query_iter_is_lazy(sample_transactions: List[Dict[str, Any]]) -> None:
+    query = TransactionQuery().where_state("EXECUTED")
+    matches = query.iter(sample_transactions)
+
+    assert next(matches).id == 1
+    assert query.stats.scanned == 1
+    assert [t.id for t in matches] == [2, 4]
+    assert query.stats.scanned == 4
+    assert query.stats.matched == 3
+
+
+def test_query_iter_with_ordering(sample_transactions: List[Dict[str, Any]]) -> None:
+    query = TransactionQuery().where_state("EXECUTED").order_by_date(reverse=True)
+
+    assert [t.id for t in query.iter(sample_transactions)] == [4, 1, 2]
+
+
+def test_query_sorts_mixed_naive_and_aware_dates() -> None:
+    transactions: List[Dict[str, Any]] = [
+        {"id": 1, "date": "2023-09-05T11:30:32Z"},
+        {"id": 2, "date": "2023-09-05T10:00:00"},
+        {"id": 3, "date": "2023-09-05T12:00:00+03:00"},
+        {"id": 4},
+    ]
+
+    result = TransactionQuery().order_by_date().run(transactions)
+    assert [t.id for t in result] == [4, 3, 2, 1]
+    assert [t.id for t in TransactionQuery().order_by_date(reverse=True).run(transactions)] == [1, 2, 3, 4]
@@ -0,0 +1,86 @@
+import json
+from datetime import date, datetime
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from src.rates_store import HistoricalRatesStore, convert_to_rub_on_date
+
+
+@pytest.fixture
+def store() -> Generator[HistoricalRatesStore, None, None]:
+    with HistoricalRatesStore() as rates_store:
+        rates_store.add_rates(
+            [
+                ("USD", "2023-01-01", 70.0),
+                ("USD", "2023-02-01", 75.0),
+                ("EUR", "2023-01-01", 80.0),
+            ]
+        )
+        yield rates_store
+
+
+@pytest.mark.parametrize(
+    "currency, on_date, expected",
+    [
+        ("USD", "2023-01-01", 70.0),
+        ("USD", "2023-01-15T10:00:00.000000", 70.0),
+        ("usd", date(2023, 2, 1), 75.0),
+        ("USD", datetime(2024, 1, 1, 12, 30), 75.0),
+        ("USD", "2022-12-31", None),
+        ("GBP", "2023-01-01", None),
+    ],
+)
+def test_get_rate(store: HistoricalRatesStore, currency: str, on_date: str, expected: float) -> None:
+    assert store.get_rate(currency, on_date) == expected
+
+
+def test_convert_to_rub_on_date(store: HistoricalRatesStore) -> None:
+    assert convert_to_rub_on_date({"amount": "10", "currency": "USD", "date": "2023-01-20T00:00:00Z"}, store) == 700.0
+    assert convert_to_rub_on_date({"amount": "10", "currency": "USD", "date": "2023-03-01T00:00:00"}, store) == 750.0
+    assert convert_to_rub_on_date({"amount": "10", "currency": "RUB"}, store) == 10.0
+    assert convert_to_rub_on_date({"amount": "10", "currency": "USD", "date": "2020-01-01"}, store) == 0.0
+    assert convert_to_rub_on_date({"amount": "10", "currency": "USD"}, store) == 0.0
+    assert convert_to_rub_on_date({"amount": "10", "currency": "USD", "date": "bad"}, store) == 0.0
+
+
+def test_add_rates_replaces_same_day(store: HistoricalRatesStore) -> None:
+    store.add_rates([("USD", "2023-01-01", 71.0)])
+    assert store.get_rate("USD", "2023-01-01") == 71.0
+    assert len(store) == 3
+
+
+def test_load_csv(tmp_path: Path) -> None:
+    file_path = tmp_path / "rates.csv"
+    file_path.write_text("date,currency,rate\n2023-01-01,USD,70.5\n2023-01-02,EUR,80.1\n", encoding="utf-8")
+
+    with HistoricalRatesStore() as rates_store:
+        assert rates_store.load_csv(file_path) == 2
+        assert rates_store.get_rate("EUR", "2023-01-05") == 80.1
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        [{"date": "2023-01-01", "currency": "USD", "rate": 70.5}],
+        {"rates": {"2023-01-01": {"USD": 70.5}}},
+        {"2023-01-01": {"USD": 70.5}},
+    ],
+)
+def test_load_json(tmp_path: Path, payload: object) -> None:
+    file_path = tmp_path / "rates.json"
+    file_path.write_text(json.dumps(payload), encoding="utf-8")
+
+    with HistoricalRatesStore() as rates_store:
+        rates_store.load_json(file_path)
+        assert rates_store.get_rate("USD", "2023-01-01") == 70.5
+
+
+def test_store_persists_on_disk(tmp_path: Path) -> None:
+    db_path = tmp_path / "rates.sqlite"
+    with HistoricalRatesStore(db_path) as rates_store:
+        rates_store.add_rates([("USD", "2023-01-01", 70.0)])
+
+    with HistoricalRatesStore(db_path) as rates_store:
+        assert rates_store.get_rate("USD", "2023-06-01") == 70.0
@@ -1,3 +1,4 @@
+import gc
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -8,7 +9,24 @@ import pytest
 from _pytest.capture import CaptureFixture
 from _pytest.logging import LogCaptureFixture
 
-from src.read_financial_file import read_financial_file
+from src import parsed_cache
+from src.read_financial_file import (
+    _convert_df_to_operations,
+    iter_csv_file,
+    iter_financial_file,
+    read_financial_file,
+    read_financial_files,
+    read_financial_records,
+)
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Направляет кэш разобранных XLSX во временный каталог, в том числе для процессов-обработчиков."""
+    directory = tmp_path / "cache"
+    monkeypatch.setattr(parsed_cache, "CACHE_DIR", str(directory))
+    monkeypatch.setenv("PARSED_CACHE_DIR", str(directory))
+    return directory
 
 
 @pytest.fixture
@@ -190,3 +208,191 @@ def test_read_financial_file_invalid_path_type(caplog: LogCaptureFixture) -> Non
         operations = read_financial_file(None)  # type: ignore [arg-type]
         assert len(operations) == 0
         assert "Путь к файлу должен быть строкой." in caplog.text
+
+
+def test_read_financial_file_skips_invalid_rows_with_summary(tmp_path: Path, caplog: LogCaptureFixture) -> None:
+    """Тестирует пропуск некорректных строк и единую сводку о них в логе."""
+    file_content: str = """date,description,amount,category
+2023-01-01,Продукты,50.00,Еда
+,Без даты,10.00,Еда
+не дата,Плохая дата,10.00,Еда
+2023-01-04,Без суммы,,Еда
+2023-01-05,Плохая сумма,abc,Еда
+2023-01-06T12:30:00,Зарплата,1000,Доход
+"""
+    file_path: Path = tmp_path / "dirty.csv"
+    file_path.write_text(file_content, encoding="utf-8-sig")
+
+    with caplog.at_level(logging.WARNING):
+        operations = read_financial_file(str(file_path))
+
+    assert [op["description"] for op in operations] == ["Продукты", "Зарплата"]
+    assert operations[1]["date"] == datetime(2023, 1, 6, 12, 30)
+    assert operations[1]["amount"] == 1000.0
+    warnings = [record.message for record in caplog.records if record.levelno == logging.WARNING]
+    assert len(warnings) == 1
+    assert "Пропущено строк: 4 из 6" in warnings[0]
+    assert "нет даты: 1 (строки 2)" in warnings[0]
+    assert "некорректная сумма: 1 (строки 5)" in warnings[0]
+
+
+def test_convert_df_to_operations_mixed_date_types() -> None:
+    """Тестирует разбор столбца дат со значениями разных типов."""
+    df = pd.DataFrame(
+        {
+            "date": [datetime(2023, 1, 1), "2023-01-02", 5, "2023-01-03T00:00:00+03:00"],
+            "description": ["a", "b", "c", "d"],
+            "amount": [1, 2, 3, 4],
+        }
+    )
+
+    operations = _convert_df_to_operations(df)
+
+    assert [op["description"] for op in operations] == ["a", "b", "d"]
+    assert operations[1]["date"] == datetime(2023, 1, 2)
+    assert all(op["category"] == "" for op in operations)
+
+
+@pytest.fixture
+def large_csv_file(tmp_path: Path) -> Generator[str, None, None]:
+    """Создает CSV-файл на 25 строк, одна из которых некорректна."""
+    lines = ["date,description,amount,category"]
+    lines += [f"2023-01-{i % 28 + 1:02d},Операция {i},{i}.50,Прочее" for i in range(25)]
+    lines[13] = "2023-01-13,Операция 12,abc,Прочее"
+    file_path: Path = tmp_path / "large.csv"
+    file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    yield str(file_path)
+
+
+def test_iter_financial_file_csv_chunks(large_csv_file: str) -> None:
+    """Тестирует чтение CSV пачками."""
+    batches = list(iter_financial_file(large_csv_file, chunksize=10))
+
+    assert [len(batch) for batch in batches] == [10, 9, 5]
+    assert [op for batch in batches for op in batch] == read_financial_file(large_csv_file)
+
+
+def test_iter_financial_file_xlsx_chunks(tmp_path: Path) -> None:
+    """Тестирует потоковое чтение XLSX пачками."""
+    df = pd.DataFrame(
+        {
+            "date": pd.date_range("2023-02-01", periods=7),
+            "description": [f"Операция {i}" for i in range(7)],
+            "amount": [float(i) for i in range(7)],
+            "category": ["Жилье"] * 7,
+        }
+    )
+    file_path = tmp_path / "stream.xlsx"
+    df.to_excel(file_path, index=False)
+
+    batches = list(iter_financial_file(str(file_path), chunksize=3))
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert batches[2][0] == {
+        "date": datetime(2023, 2, 7),
+        "description": "Операция 6",
+        "amount": 6.0,
+        "category": "Жилье",
+    }
+    assert [op for batch in batches for op in batch] == read_financial_file(str(file_path))
+
+
+def test_iter_financial_file_missing_columns(tmp_path: Path, caplog: LogCaptureFixture) -> None:
+    """Тестирует, что при отсутствии колонок ошибка пишется один раз."""
+    file_path = tmp_path / "malformed.csv"
+    file_path.write_text("date,description\n" + "2023-03-01,Обед\n" * 5, encoding="utf-8")
+
+    with caplog.at_level(logging.ERROR):
+        assert list(iter_financial_file(str(file_path), chunksize=2)) == []
+    assert sum("Отсутствуют обязательные колонки" in record.message for record in caplog.records) == 1
+
+
+@pytest.mark.filterwarnings("error::ResourceWarning")
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+def test_iter_csv_file_closes_reader(tmp_path: Path) -> None:
+    """Тестирует, что файл закрывается при отсутствии колонок и при досрочном завершении перебора."""
+    malformed = tmp_path / "malformed.csv"
+    malformed.write_text("date,description\n2023-03-01,Обед\n", encoding="utf-8")
+    valid = tmp_path / "valid.csv"
+    valid.write_text(
+        "id,state,date,amount,currency_name,currency_code,from,to,description\n"
+        + "1,EXECUTED,2023-03-01,100,Ruble,RUB,,Счет 1234,Обед\n" * 5,
+        encoding="utf-8",
+    )
+
+    assert list(iter_financial_file(str(malformed))) == []
+    batches = iter_csv_file(str(valid), chunksize=2)
+    assert len(next(batches)) == 2
+    batches.close()
+    gc.collect()
+
+
+@pytest.mark.parametrize("file_path", ["non_existent_file.csv", "non_existent_file.xlsx", "file.txt", 123])
+def test_iter_financial_file_unreadable(file_path: Any) -> None:
+    """Тестирует потоковое чтение отсутствующих и неподдерживаемых файлов."""
+    assert list(iter_financial_file(file_path)) == []
+
+
+def test_iter_financial_file_corrupted_excel(tmp_path: Path, caplog: LogCaptureFixture) -> None:
+    """Тестирует потоковое чтение повреждённого Excel-файла."""
+    file_path = tmp_path / "corrupted.xlsx"
+    file_path.write_text("This is not an Excel file content.", encoding="utf-8")
+
+    with caplog.at_level(logging.ERROR):
+        assert list(iter_financial_file(str(file_path))) == []
+    assert "Ошибка чтения Excel файла" in caplog.text
+
+
+def test_read_financial_records(sample_csv_file: str) -> None:
+    """Тестирует чтение файла в виде записей Transaction."""
+    records = read_financial_records(sample_csv_file)
+
+    assert [record.description for record in records] == ["Продукты", "Зарплата"]
+    assert records[0].date == datetime(2023, 1, 1)
+    assert records[0].amount == 50.0
+    assert records[0].category == "Еда"
+
+
+@pytest.fixture
+def statements_dir(tmp_path: Path) -> Path:
+    """Каталог с выписками: два CSV, один XLSX, один повреждённый файл и один посторонний."""
+    directory = tmp_path / "statements"
+    directory.mkdir()
+    (directory / "2023-01.csv").write_text(
+        "date,description,amount\n2023-01-01,Январь 1,1.00\n2023-01-02,Январь 2,2.00\n", encoding="utf-8"
+    )
+    (directory / "2023-03.csv").write_text("date,description\n2023-03-01,Без суммы\n", encoding="utf-8")
+    pd.DataFrame({"date": ["2023-02-01"], "description": ["Февраль"], "amount": [3.0]}).to_excel(
+        directory / "2023-02.xlsx", index=False
+    )
+    (directory / "2023-04.xlsx").write_text("not an excel file", encoding="utf-8")
+    (directory / "notes.txt").write_text("не выписка", encoding="utf-8")
+    return directory
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_read_financial_files_directory(statements_dir: Path, max_workers: int) -> None:
+    operations, reports = read_financial_files(str(statements_dir), max_workers=max_workers)
+
+    assert [op["description"] for op in operations] == ["Январь 1", "Январь 2", "Февраль"]
+    assert operations[2]["date"] == datetime(2023, 2, 1)
+    assert [Path(report.path).name for report in reports] == [
+        "2023-01.csv",
+        "2023-02.xlsx",
+        "2023-03.csv",
+        "2023-04.xlsx",
+    ]
+    assert [report.operations for report in reports] == [2, 1, 0, 0]
+    assert [report.ok for report in reports] == [True, True, False, False]
+    assert "amount" in str(reports[2].error)
+
+
+def test_read_financial_files_glob(statements_dir: Path) -> None:
+    operations, reports = read_financial_files(str(statements_dir / "*.csv"), max_workers=2)
+
+    assert len(operations) == 2
+    assert len(reports) == 2
+
+
+def test_read_financial_files_no_matches(tmp_path: Path) -> None:
+    assert read_financial_files(str(tmp_path / "*.csv")) == ([], [])
@@ -0,0 +1,145 @@
+from typing import Dict, List
+
+import pytest
+
+from src.models import Transaction
+from src.search_index import DescriptionIndex, TrigramIndex, _RowIndex
+from src.transaction_frame import TransactionFrame
+
+
+@pytest.fixture
+def transactions() -> List[Dict[str, str]]:
+    return [
+        {"description": "Перевод организации"},
+        {"description": "Оплата услуг"},
+        {"description": "Открытие вклада"},
+        {"description": "Перевод с карты на карту"},
+        {},
+        {"description": "Перевод со счета на счет"},
+    ]
+
+
+@pytest.fixture
+def index(transactions: List[Dict[str, str]]) -> DescriptionIndex:
+    return DescriptionIndex.from_transactions(transactions)
+
+
+def test_lookup(index: DescriptionIndex) -> None:
+    assert index.lookup("ПЕРЕВОД").tolist() == [0, 3, 5]
+    assert index.lookup("карт").tolist() == []
+    assert index.lookup_prefix("карт").tolist() == [3]
+    assert index.lookup_prefix("сч").tolist() == [5]
+    assert index.lookup_prefix("о").tolist() == [0, 1, 2]
+
+
+@pytest.mark.parametrize(
+    "query, prefix, expected",
+    [
+        ("перевод карты", False, [3]),
+        ("перев карт", True, [3]),
+        ("перевод вклада", True, []),
+        ("несуществующее", True, []),
+        ("", True, [0, 1, 2, 3, 4, 5]),
+    ],
+)
+def test_search(index: DescriptionIndex, query: str, prefix: bool, expected: List[int]) -> None:
+    assert index.search(query, prefix=prefix).tolist() == expected
+
+
+def test_find_falls_back_to_regex(index: DescriptionIndex) -> None:
+    assert index.find(r"перевод\s+с").tolist() == [3, 5]
+    assert index.find("на карту").tolist() == [3]
+    assert index.find("[").tolist() == []
+
+
+def test_append_is_incremental(index: DescriptionIndex, transactions: List[Dict[str, str]]) -> None:
+    found = index.search("перевод")
+    row = index.append("Перевод в магазин")
+
+    assert row == 6
+    assert found.tolist() == [0, 3, 5]
+    assert index.search("перевод маг").tolist() == [6]
+    assert len(index) == 7
+
+    index.append("Аванс по договору")
+    assert index.lookup_prefix("ав").tolist() == [7]
+    assert index.lookup_prefix("п").tolist() == [0, 3, 5, 6, 7]
+
+
+def test_select(index: DescriptionIndex, transactions: List[Dict[str, str]]) -> None:
+    rows = index.search("перевод счета")
+    assert index.select(transactions, rows) == [transactions[5]]
+
+    frame = TransactionFrame.from_records(transactions)
+    frame_index = DescriptionIndex.from_transactions(frame)
+    assert index.select(frame, frame_index.search("перевод")).descriptions.tolist() == [
+        "Перевод организации",
+        "Перевод с карты на карту",
+        "Перевод со счета на счет",
+    ]
+
+
+def test_from_records(transactions: List[Dict[str, str]]) -> None:
+    records = [Transaction.from_dict(t) for t in transactions]
+    assert DescriptionIndex.from_transactions(records).search("оплата").tolist() == [1]
+
+
+@pytest.fixture
+def trigram_index(transactions: List[Dict[str, str]]) -> TrigramIndex:
+    index = TrigramIndex.from_transactions(transactions)
+    index.append("ПЕРЕВОД   ОРГАНИЗАЦИИ")
+    return index
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("перевод организации", [0, 6]),
+        ("ревод с", [3, 5]),
+        ("на кар", [3]),
+        ("уг", [1]),
+        ("чет", [5]),
+        ("перевод вклада", []),
+        ("", [0, 1, 2, 3, 4, 5, 6]),
+    ],
+)
+def test_trigram_substring(trigram_index: TrigramIndex, query: str, expected: List[int]) -> None:
+    assert trigram_index.search_substring(query).tolist() == expected
+
+
+def test_trigram_substring_matches_scan(transactions: List[Dict[str, str]]) -> None:
+    index = TrigramIndex.from_transactions(transactions)
+    descriptions = [t.get("description", "").lower() for t in transactions]
+    for query in ["пере", "а", "ка", "на с", "о", "вклада", "xyz"]:
+        expected = [row for row, text in enumerate(descriptions) if text and query in text]
+        assert index.search_substring(query).tolist() == expected
+
+
+def test_trigram_fuzzy(trigram_index: TrigramIndex) -> None:
+    rows, scores = trigram_index.search_fuzzy("перевод организаций")
+
+    assert rows.tolist()[:2] == [0, 6]
+    assert scores[0] == scores[1] > 0.6
+    assert all(scores[i] >= scores[i + 1] for i in range(len(scores) - 1))
+    assert trigram_index.distinct_descriptions == 5
+
+
+def test_trigram_fuzzy_threshold_and_limit(trigram_index: TrigramIndex) -> None:
+    rows, _ = trigram_index.search_fuzzy("Оплата услуг", limit=1)
+    assert rows.tolist() == [1]
+
+    rows, scores = trigram_index.search_fuzzy("совсем другое", threshold=0.9)
+    assert len(rows) == len(scores) == 0
+    assert len(trigram_index.search_fuzzy("zz")[0]) == 0
+
+
+def test_trigram_substring_keeps_query_spaces() -> None:
+    index = TrigramIndex(["Магазин №12", "Магазин №123", "Магазин №12 Москва"])
+
+    assert index.search_substring("№12 ").tolist() == [2]
+    assert index.search_substring("№12").tolist() == [0, 1, 2]
+
+
+def test_row_index_requires_append() -> None:
+    with pytest.raises(TypeError):
+        _RowIndex()  # type: ignore[abstract]
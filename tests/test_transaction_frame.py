@@ -0,0 +1,140 @@
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+
+from src.transaction_frame import MISSING, TransactionFrame
+
+
+@pytest.fixture
+def sample_transactions() -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": 1,
+            "state": "EXECUTED",
+            "date": "2019-12-08T22:45:06.000000",
+            "operationAmount": {"amount": "40542.00", "currency": {"name": "руб.", "code": "RUB"}},
+            "description": "Открытие вклада",
+            "to": "Счет 64686473678894779589",
+        },
+        {
+            "id": 2,
+            "state": "CANCELED",
+            "date": "2019-11-12T19:35:28.123456",
+            "operationAmount": {"amount": "130.50", "currency": {"name": "USD", "code": "USD"}},
+            "description": "Перевод с карты на карту",
+            "from": "MasterCard 7771 27** **** 3727",
+            "to": "Visa Platinum 1293 38** **** 9203",
+        },
+        {
+            "id": 3,
+            "state": "EXECUTED",
+            "date": "2019-12-08T22:45:06.000000",
+            "operationAmount": {"amount": "8390.00", "currency": {"name": "руб.", "code": "RUB"}},
+            "description": "Перевод организации",
+            "from": "Visa Platinum 7492 65** **** 7202",
+            "to": "Счет 74489636417521191160",
+        },
+    ]
+
+
+def test_round_trip(sample_transactions: List[Dict[str, Any]]) -> None:
+    frame = TransactionFrame.from_records(sample_transactions)
+
+    assert len(frame) == 3
+    assert frame.to_records() == sample_transactions
+
+
+def test_columns_are_compact(sample_transactions: List[Dict[str, Any]]) -> None:
+    frame = TransactionFrame.from_records(sample_transactions)
+
+    assert frame.dates.dtype == np.int64
+    assert frame.amounts.tolist() == [4054200, 13050, 839000]
+    assert frame.states == ["EXECUTED", "CANCELED"]
+    assert frame.state_codes.tolist() == [0, 1, 0]
+    assert frame.currencies == ["RUB", "USD"]
+    assert frame.amounts_float.tolist() == [40542.0, 130.5, 8390.0]
+
+
+def test_filter_by_state_and_currency(sample_transactions: List[Dict[str, Any]]) -> None:
+    frame = TransactionFrame.from_records(sample_transactions)
+
+    assert frame.filter_by_state("EXECUTED").ids.tolist() == [1, 3]
+    assert frame.filter_by_currency("USD").ids.tolist() == [2]
+    assert len(frame.filter_by_state("PENDING")) == 0
+    assert frame.filter_by_state("EXECUTED").filter_by_currency("RUB").ids.tolist() == [1, 3]
+
+
+def test_sort_by_date_is_stable(sample_transactions: List[Dict[str, Any]]) -> None:
+    frame = TransactionFrame.from_records(sample_transactions)
+
+    assert frame.sort_by_date().ids.tolist() == [2, 1, 3]
+    assert frame.sort_by_date(reverse=True).ids.tolist() == [1, 3, 2]
+
+
+def test_flat_and_incomplete_records() -> None:
+    frame = TransactionFrame.from_records(
+        [
+            {"amount": 100, "currency": "USD", "description": "Payment 1"},
+            {"description": "Без суммы", "date": "not a date"},
+            {"date": "2023-09-05T11:30:32Z", "operationAmount": {"amount": "16210"}},
+        ]
+    )
+
+    assert frame.currencies == ["USD"]
+    assert frame.dates[1] == MISSING
+    assert frame.to_records() == [
+        {
+            "operationAmount": {"amount": "100.00", "currency": {"name": "USD", "code": "USD"}},
+            "description": "Payment 1",
+        },
+        {"description": "Без суммы"},
+        {"date": "2023-09-05T11:30:32.000000+00:00", "operationAmount": {"amount": "16210.00"}},
+    ]
+    assert np.isnan(frame.amounts_float[1])
+
+
+def test_dates_keep_timezone_offset() -> None:
+    frame = TransactionFrame.from_records(
+        [
+            {"id": 1, "date": "2023-09-05T11:30:32+03:00"},
+            {"id": 2, "date": "2023-09-05T09:00:00"},
+            {"id": 3, "date": "2023-09-05T05:30:00-05:30"},
+        ]
+    )
+
+    assert [record["date"] for record in frame.to_records()] == [
+        "2023-09-05T11:30:32.000000+03:00",
+        "2023-09-05T09:00:00.000000",
+        "2023-09-05T05:30:00.000000-05:30",
+    ]
+    assert frame.sort_by_date().ids.tolist() == [1, 2, 3]
+    assert frame.sort_by_date().to_records()[0]["date"] == "2023-09-05T11:30:32.000000+03:00"
+
+
+@pytest.mark.parametrize(
+    "amount, expected",
+    [
+        ("1.005", 100),
+        ("1.015", 102),
+        ("Infinity", MISSING),
+        ("-Infinity", MISSING),
+        ("NaN", MISSING),
+        ("1e30", MISSING),
+        ("92233720368547758.07", 9223372036854775807),
+        ("-92233720368547758.08", MISSING),
+        ("abc", MISSING),
+    ],
+)
+def test_amounts_rounding_and_out_of_range(amount: str, expected: int) -> None:
+    frame = TransactionFrame.from_records([{"amount": amount}])
+
+    assert frame.amounts.tolist() == [expected]
+
+
+def test_empty_frame() -> None:
+    frame = TransactionFrame.from_records([])
+
+    assert len(frame) == 0
+    assert frame.to_records() == []
+    assert len(frame.sort_by_date(reverse=True).filter_by_state("EXECUTED")) == 0
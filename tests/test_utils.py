@@ -1,10 +1,12 @@
+import json
+from itertools import islice
 from pathlib import Path
-from typing import Iterator, Tuple
+from typing import Any, Dict, Iterator, List, Tuple
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.utils import load_transactions
+from src.utils import iter_transactions, load_transaction_records, load_transactions
 
 
 @pytest.fixture
@@ -56,3 +58,80 @@ def test_io_error(mock_file_system: Tuple[MagicMock, MagicMock]) -> None:
 
     result = load_transactions("error.json")
     assert result == []
+
+
+@pytest.fixture
+def stream_transactions() -> List[Dict[str, Any]]:
+    return [
+        {"id": i, "state": "EXECUTED", "description": f"Перевод {i}", "nested": {"list": [i, "]", "{"]}}
+        for i in range(50)
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_iter_transactions_json_array(
+    tmp_path: Path, stream_transactions: List[Dict[str, Any]], chunk_size: int
+) -> None:
+    file_path = tmp_path / "operations.json"
+    file_path.write_text(json.dumps(stream_transactions, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    assert list(iter_transactions(str(file_path), chunk_size=chunk_size)) == stream_transactions
+
+
+@pytest.mark.parametrize("chunk_size", [3, 65536])
+def test_iter_transactions_json_lines(
+    tmp_path: Path, stream_transactions: List[Dict[str, Any]], chunk_size: int
+) -> None:
+    file_path = tmp_path / "operations.jsonl"
+    lines = [json.dumps(t, ensure_ascii=False) for t in stream_transactions]
+    file_path.write_text("\n".join(lines[:10] + ["", "not json"] + lines[10:]), encoding="utf-8")
+
+    assert list(iter_transactions(str(file_path), chunk_size=chunk_size)) == stream_transactions
+
+
+def test_iter_transactions_stops_early(tmp_path: Path, stream_transactions: List[Dict[str, Any]]) -> None:
+    file_path = tmp_path / "operations.json"
+    file_path.write_text(json.dumps(stream_transactions), encoding="utf-8")
+
+    with patch.object(Path, "open", wraps=file_path.open) as mock_open:
+        first = list(islice(iter_transactions(str(file_path), chunk_size=16), 2))
+        mock_open.assert_called_once()
+    assert first == stream_transactions[:2]
+
+
+def test_iter_transactions_skips_non_objects(tmp_path: Path) -> None:
+    file_path = tmp_path / "operations.json"
+    file_path.write_text('[{"id": 1}, 2, "text", null, {"id": 3}]', encoding="utf-8")
+
+    assert list(iter_transactions(str(file_path))) == [{"id": 1}, {"id": 3}]
+
+
+@pytest.mark.parametrize("content", ['[{"id": 1}, {"id": 2}', '[{"id": 1}, {"id": ', '[{"id": 1}, {oops}]'])
+def test_iter_transactions_malformed_tail(tmp_path: Path, content: str) -> None:
+    file_path = tmp_path / "broken.json"
+    file_path.write_text(content, encoding="utf-8")
+
+    assert list(iter_transactions(str(file_path), chunk_size=4))[0] == {"id": 1}
+
+
+@pytest.mark.parametrize("content", ["", "   \n  ", "[]"])
+def test_iter_transactions_empty(tmp_path: Path, content: str) -> None:
+    file_path = tmp_path / "empty.json"
+    file_path.write_text(content, encoding="utf-8")
+
+    assert list(iter_transactions(str(file_path))) == []
+
+
+def test_iter_transactions_file_not_exists() -> None:
+    assert list(iter_transactions("nonexistent.json")) == []
+
+
+def test_load_transaction_records(tmp_path: Path, stream_transactions: List[Dict[str, Any]]) -> None:
+    file_path = tmp_path / "operations.json"
+    file_path.write_text(json.dumps(stream_transactions), encoding="utf-8")
+
+    records = load_transaction_records(str(file_path))
+
+    assert len(records) == 50
+    assert records[3].description == "Перевод 3"
+    assert records[3].state == "EXECUTED"
@@ -2,6 +2,7 @@ from typing import Any, NoReturn, Optional
 
 import pytest
 
+from src.masks import MASK_CACHE_SIZE, clear_mask_cache, mask_cache_info
 from src.widget import get_date, mask_account_card
 
 
@@ -62,3 +63,17 @@ def mock_fail(_: str) -> NoReturn:
 def test_error_handling(monkeypatch: Any) -> None:
     monkeypatch.setattr("src.widget.mask_account_card", mock_fail)
     assert mask_account_card("Счет 123") == "Счет 123"
+
+
+def test_mask_account_card_cache() -> None:
+    """Тестирует кэширование маскировки: повторная строка не маскируется заново"""
+    clear_mask_cache()
+    for _ in range(3):
+        assert mask_account_card("Счет 12345678901234567890") == "Счет ****************7890"
+
+    stats = mask_cache_info()["src.widget._mask_account_card"]
+    assert stats == {"hits": 2, "misses": 1, "maxsize": MASK_CACHE_SIZE, "currsize": 1}
+    assert mask_cache_info()["src.masks.get_mask_account"]["misses"] == 1
+
+    clear_mask_cache()
+    assert all(info["currsize"] == 0 for info in mask_cache_info().values())